@@ -1,24 +1,94 @@
-from ambiente import Ambiente, Posicao, Observacao, Direcao, Acao
-from typing import Set, List
+from ambiente import Ambiente, Posicao, Observacao, Direcao, Acao, njit
+from typing import Set, List, Dict, Optional
 import numpy as np
-import random
+
+
+# Assinatura explícita: com o Numba, a compilação é feita (ou lida da cache)
+# na importação do módulo, e não na primeira chamada a agir()
+_ASSINATURA_PASSO_FAROL = ('Tuple((int64, int64, float64, boolean, boolean))'
+                           '(int64, int64, int64, int64, int64, int64, uint8[:, ::1])')
+
+
+@njit(_ASSINATURA_PASSO_FAROL, cache=True)
+def _passo_farol(ax, ay, ddx, ddy, farol_x, farol_y, grid_bordas):
+    """
+    Núcleo numérico de um movimento no Farol
+
+    grid_bordas é o grid de ocupação com uma borda de obstáculos, pelo que
+    sair dos limites e bater num obstáculo são o mesmo teste (bit 0).
+    Coordenadas fora do grid com borda são encostadas à borda.
+
+    Returns:
+        (nx, ny, recompensa, valido, chegou)
+    """
+    nx = ax + ddx
+    ny = ay + ddy
+    bx = min(max(nx + 1, 0), grid_bordas.shape[0] - 1)
+    by = min(max(ny + 1, 0), grid_bordas.shape[1] - 1)
+
+    # Movimento inválido (parede/obstáculo/fora do grid): fica no lugar
+    if grid_bordas[bx, by] & 1:
+        return ax, ay, -0.5, False, False  # Penalização maior para desencorajar
+
+    # Recompensa baseada na aproximação ao farol (Manhattan)
+    dist_antiga = abs(farol_x - ax) + abs(farol_y - ay)
+    dist_nova = abs(farol_x - nx) + abs(farol_y - ny)
+    if dist_nova < dist_antiga:
+        recompensa = 2.0  # Recompensa maior por aproximação
+    elif dist_nova > dist_antiga:
+        recompensa = -1.0  # Penalização maior por afastamento
+    else:
+        recompensa = -0.1  # Pequena penalização por não progredir
+
+    return nx, ny, recompensa, True, dist_nova == 0
 
 
 class AmbienteFarol(Ambiente):
     """Ambiente do problema do Farol"""
 
+    # Bits do grid de ocupação
+    OBSTACULO = 1
+    FAROL = 2
+    AGENTE = 4
+
+    # A partir de quantos agentes a distância média é calculada com ufuncs
+    LIMIAR_VETORIZACAO = 64
+
+    # Direções vizinhas com o respetivo nome e deslocamento (evita recriar a lista e aceder a .name)
+    _DIRECOES_COM_NOMES = tuple((d.name, d.value[0], d.value[1])
+                                for d in (Direcao.NORTE, Direcao.SUL, Direcao.ESTE, Direcao.OESTE))
+
     def __init__(self, largura: int = 10, altura: int = 10,
                  pos_farol: Posicao = None, com_obstaculos: bool = False,
                  mover_farol: bool = True, mover_obstaculos: bool = True,
-                 intervalo_movimento: int = 20):
+                 intervalo_movimento: int = 20, seed: Optional[int] = None):
         super().__init__(largura, altura)
 
+        # Grid de ocupação indexado por [x, y] (bits OBSTACULO, FAROL, AGENTE).
+        # self.grid é uma vista do interior de um grid com borda de obstáculos,
+        # para que vizinhos fora dos limites contem como bloqueados sem testes extra
+        self._grid_bordas = np.full((largura + 2, altura + 2), self.OBSTACULO, dtype=np.uint8)
+        self.grid = self._grid_bordas[1:-1, 1:-1]
+        self.grid[:] = 0
+
         # Posição do farol (objetivo)
         self.pos_farol = pos_farol or Posicao(largura // 2, altura // 2)
         self.pos_farol_inicial = Posicao(self.pos_farol.x, self.pos_farol.y)
+        self.grid[self.pos_farol.x, self.pos_farol.y] |= self.FAROL
+
+        # Posições dos agentes em SoA (índice dado por _indice_agente)
+        self.agentes_x = np.empty(0, dtype=np.int32)
+        self.agentes_y = np.empty(0, dtype=np.int32)
+        self._indice_agente: Dict[str, int] = {}
+
+        # Gerador aleatório persistente (sorteios em lote); seed torna a
+        # colocação de obstáculos e os movimentos do farol reprodutíveis
+        self.rng = np.random.default_rng(seed)
+
+        # Constantes derivadas das dimensões (calculadas uma única vez)
+        self._num_obstaculos = (largura * altura) // 10
 
         # Obstáculos (opcionais)
-        self.obstaculos: Set[Posicao] = set()
         self.com_obstaculos = com_obstaculos
         if com_obstaculos:
             self._gerar_obstaculos()
@@ -29,79 +99,88 @@ class AmbienteFarol(Ambiente):
         self.intervalo_movimento = intervalo_movimento  # A cada N passos
         self.ultimo_movimento = 0
 
+        # Agentes que já chegaram ao farol neste episódio
+        self._chegaram: Set[str] = set()
+
+        # Distâncias médias por passo num buffer pré-alocado (cresce por duplicação);
+        # metricas['distancias_medias'] é a vista da parte usada
+        self._reiniciar_distancias()
+        self._tmp_dx = np.empty(0, dtype=np.int32)
+        self._tmp_dy = np.empty(0, dtype=np.int32)
+
         # Métricas específicas
         self.metricas.update({
             'agentes_no_farol': 0,
-            'distancias_medias': [],
-            'tempos_chegada': {}
+            'tempos_chegada': {},
+            'distancias_medias': self._distancias[:0]
         })
 
-    def _obter_posicoes_ocupadas(self) -> Set[Posicao]:
-        """Retorna conjunto de posições ocupadas (farol + agentes)"""
-        ocupadas = {self.pos_farol}
-        for agente_id, info in self.agentes.items():
-            ocupadas.add(info['posicao'])
-        return ocupadas
+    def registar_agente(self, agente_id: str, posicao: Posicao):
+        """Regista um agente e a sua posição nos arrays SoA"""
+        super().registar_agente(agente_id, posicao)
+        if agente_id not in self._indice_agente:
+            self._indice_agente[agente_id] = len(self.agentes_x)
+            self.agentes_x = np.append(self.agentes_x, np.int32(posicao.x))
+            self.agentes_y = np.append(self.agentes_y, np.int32(posicao.y))
+        else:
+            self._atualizar_posicao(agente_id, posicao)
+
+    def _atualizar_posicao(self, agente_id: str, posicao: Posicao):
+        """Atualiza a posição de um agente no dicionário e nos arrays SoA"""
+        self.agentes[agente_id]['posicao'] = posicao
+        indice = self._indice_agente[agente_id]
+        self.agentes_x[indice] = posicao.x
+        self.agentes_y[indice] = posicao.y
+
+    @property
+    def obstaculos(self) -> Set[Posicao]:
+        """Conjunto de obstáculos, materializado a partir do grid"""
+        xs, ys = np.nonzero(self.grid & self.OBSTACULO)
+        return {Posicao.obter(int(x), int(y)) for x, y in zip(xs, ys)}
+
+    def _marcar_agentes(self):
+        """Atualiza os bits dos agentes no grid a partir dos arrays SoA"""
+        self.grid &= np.uint8(~self.AGENTE & 0xFF)
+        dentro = ((self.agentes_x >= 0) & (self.agentes_x < self.largura) &
+                  (self.agentes_y >= 0) & (self.agentes_y < self.altura))
+        self.grid[self.agentes_x[dentro], self.agentes_y[dentro]] |= self.AGENTE
+
+    def _obter_posicoes_ocupadas(self) -> np.ndarray:
+        """Retorna máscara das posições ocupadas (farol + agentes)"""
+        return (self.grid & (self.FAROL | self.AGENTE)) != 0
     
+    def _colocar_obstaculos(self, num_obstaculos: int):
+        """Coloca obstáculos em células livres sorteadas sem repetição"""
+        posicoes_ocupadas = self._obter_posicoes_ocupadas()
+        self.grid &= np.uint8(~self.OBSTACULO & 0xFF)
+
+        livres = np.flatnonzero(~posicoes_ocupadas)
+        escolhidas = self.rng.choice(livres, size=min(num_obstaculos, livres.size), replace=False)
+        xs, ys = np.divmod(escolhidas, self.altura)
+        self.grid[xs, ys] |= self.OBSTACULO
+
     def _gerar_obstaculos(self):
         """Gera obstáculos aleatórios no ambiente, evitando farol e agentes"""
-        posicoes_ocupadas = self._obter_posicoes_ocupadas()
-        num_obstaculos = (self.largura * self.altura) // 10
-        tentativas = 0
-        max_tentativas = num_obstaculos * 10
-        
-        self.obstaculos.clear()
-        while len(self.obstaculos) < num_obstaculos and tentativas < max_tentativas:
-            x = random.randint(0, self.largura - 1)
-            y = random.randint(0, self.altura - 1)
-            pos = Posicao(x, y)
-            if pos not in posicoes_ocupadas:
-                self.obstaculos.add(pos)
-            tentativas += 1
+        self._colocar_obstaculos(self._num_obstaculos)
     
     def _mover_farol(self):
-        """Move o farol para uma nova posição aleatória"""
-        posicoes_ocupadas = self._obter_posicoes_ocupadas()
-        tentativas = 0
-        max_tentativas = 100
-        
-        while tentativas < max_tentativas:
-            x = random.randint(0, self.largura - 1)
-            y = random.randint(0, self.altura - 1)
-            nova_pos = Posicao(x, y)
-            
-            # Verificar se posição é válida (não ocupada e não tem obstáculo)
-            if nova_pos not in posicoes_ocupadas and nova_pos not in self.obstaculos:
-                self.pos_farol = nova_pos
-                return True
-            tentativas += 1
-        
-        return False  # Não conseguiu mover
+        """Move o farol para uma célula livre sorteada (sem obstáculo nem agente)"""
+        livres = np.flatnonzero(self.grid == 0)
+        if livres.size == 0:
+            return False  # Não conseguiu mover
+
+        x, y = divmod(int(self.rng.choice(livres)), self.altura)
+        self.grid[self.pos_farol.x, self.pos_farol.y] &= np.uint8(~self.FAROL & 0xFF)
+        self.grid[x, y] |= self.FAROL
+        self.pos_farol = Posicao.obter(x, y)
+        return True
     
     def _mover_obstaculos(self):
-        """Move obstáculos para novas posições"""
+        """Move obstáculos para novas posições (podem coincidir com as antigas)"""
         if not self.com_obstaculos:
             return
         
-        posicoes_ocupadas = self._obter_posicoes_ocupadas()
-        novos_obstaculos = set()
-        num_obstaculos = len(self.obstaculos)
-        tentativas = 0
-        max_tentativas = num_obstaculos * 10
-        
-        while len(novos_obstaculos) < num_obstaculos and tentativas < max_tentativas:
-            x = random.randint(0, self.largura - 1)
-            y = random.randint(0, self.altura - 1)
-            pos = Posicao(x, y)
-            
-            # Verificar se posição é válida (não ocupada, não é farol, não é obstáculo existente)
-            if (pos not in posicoes_ocupadas and 
-                pos != self.pos_farol and 
-                pos not in novos_obstaculos):
-                novos_obstaculos.add(pos)
-            tentativas += 1
-        
-        self.obstaculos = novos_obstaculos
+        self._colocar_obstaculos(int(np.count_nonzero(self.grid & self.OBSTACULO)))
 
     def observacao_para(self, agente_id: str) -> Observacao:
         pos_agente = self.obter_posicao_agente(agente_id)
@@ -113,72 +192,80 @@ class AmbienteFarol(Ambiente):
         dy = self.pos_farol.y - pos_agente.y
 
         # Detetar obstáculos nas direções adjacentes
-        obstaculos_vizinhos = {}
-        for direcao in [Direcao.NORTE, Direcao.SUL, Direcao.ESTE, Direcao.OESTE]:
-            pos_vizinha = pos_agente.mover(direcao)
-            obstaculos_vizinhos[direcao.name] = (
-                    not self.posicao_valida(pos_vizinha) or
-                    pos_vizinha in self.obstaculos
-            )
+        grid_bordas = self._grid_bordas
+        obstaculo = self.OBSTACULO
+        if self.posicao_valida(pos_agente):
+            # Coordenadas no grid com borda: vizinhos nunca saem do array
+            ax, ay = pos_agente.x + 1, pos_agente.y + 1
+            obstaculos_vizinhos = {nome: bool(grid_bordas[ax + ddx, ay + ddy] & obstaculo)
+                                   for nome, ddx, ddy in self._DIRECOES_COM_NOMES}
+        else:
+            # Agente fora do grid: coordenadas encostadas à borda (bloqueada)
+            max_x, max_y = self.largura + 1, self.altura + 1
+            obstaculos_vizinhos = {
+                nome: bool(grid_bordas[min(max(pos_agente.x + 1 + ddx, 0), max_x),
+                                       min(max(pos_agente.y + 1 + ddy, 0), max_y)] & obstaculo)
+                for nome, ddx, ddy in self._DIRECOES_COM_NOMES}
 
         dados_obs = {
             'direcao_farol': (dx, dy),
-            'distancia_farol': pos_agente.distancia(self.pos_farol),
+            'distancia_farol': abs(dx) + abs(dy),
             'obstaculos_vizinhos': obstaculos_vizinhos,
             'posicao_atual': (pos_agente.x, pos_agente.y),
-            'no_farol': pos_agente == self.pos_farol
+            'no_farol': dx == 0 and dy == 0
         }
 
         return Observacao(dados_obs, agente_id)
 
+    def _agir_chegado(self, accao: Acao, agente_id: str) -> float:
+        """Caminho rápido para agentes que já chegaram ao farol"""
+        if accao.tipo != "mover":
+            return 0.0
+
+        pos_atual = self.agentes[agente_id]['posicao']
+        nova_pos = pos_atual.mover(accao.direcao)
+
+        # Se já chegou, não dar recompensas por ficar parado ou se mover
+        if pos_atual == self.pos_farol and nova_pos != self.pos_farol:
+            recompensa = -0.1  # Pequena penalização por sair do objetivo
+        else:
+            # Se já chegou, recompensa zero (ou muito pequena negativa para desencorajar movimento)
+            recompensa = -0.01 if nova_pos != pos_atual else 0.0
+        self._atualizar_posicao(agente_id, nova_pos)
+        return recompensa
+
     def agir(self, accao: Acao, agente_id: str) -> float:
-        if agente_id not in self.agentes:
+        # Agentes que já chegaram seguem o caminho rápido
+        if agente_id in self._chegaram:
+            return self._agir_chegado(accao, agente_id)
+
+        agente = self.agentes.get(agente_id)
+        if agente is None:
             return 0.0
 
-        agente = self.agentes[agente_id]
         pos_atual = agente['posicao']
         recompensa = 0.0
 
-        # Verificar se agente já chegou ao objetivo
-        ja_chegou = agente_id in self.metricas['tempos_chegada']
-        
         if accao.tipo == "mover":
-            direcao = accao.parametros.get('direcao', Direcao.PARADO)
-            nova_pos = pos_atual.mover(direcao)
-
-            # Se já chegou, não dar recompensas por ficar parado ou se mover
-            if ja_chegou:
-                # Se está no farol e tenta sair, pequena penalização
-                if pos_atual == self.pos_farol and nova_pos != self.pos_farol:
-                    recompensa = -0.1  # Pequena penalização por sair do objetivo
-                else:
-                    # Se já chegou, recompensa zero (ou muito pequena negativa para desencorajar movimento)
-                    recompensa = -0.01 if nova_pos != pos_atual else 0.0
-                agente['posicao'] = nova_pos
-                return recompensa
-
-            # Verificar se movimento é válido
-            if (self.posicao_valida(nova_pos) and
-                    nova_pos not in self.obstaculos):
-
-                agente['posicao'] = nova_pos
-                agente['historico_posicoes'].append(nova_pos)
+            direcao = accao.direcao
+            farol = self.pos_farol
 
-                # Recompensa baseada na aproximação ao farol
-                dist_antiga = pos_atual.distancia(self.pos_farol)
-                dist_nova = nova_pos.distancia(self.pos_farol)
+            # Transição e recompensa calculadas pelo núcleo numérico
+            ddx, ddy = direcao.value
+            _, _, recompensa, valido, chegou = _passo_farol(
+                pos_atual.x, pos_atual.y, ddx, ddy, farol.x, farol.y,
+                self._grid_bordas)
 
-                if dist_nova < dist_antiga:
-                    recompensa = 2.0  # Recompensa maior por aproximação
-                elif dist_nova > dist_antiga:
-                    recompensa = -1.0  # Penalização maior por afastamento
-                else:
-                    recompensa = -0.1  # Pequena penalização por não progredir
+            if valido:
+                nova_pos = pos_atual.mover(direcao)
+                self._atualizar_posicao(agente_id, nova_pos)
+                agente['historico_posicoes'].append(nova_pos)
 
                 # Recompensa por alcançar o farol (escalonada)
-                if nova_pos == self.pos_farol:
+                if chegou:
+                    metricas = self.metricas
                     # Contar quantos agentes já chegaram
-                    num_ja_chegaram = self.metricas['agentes_no_farol']
+                    num_ja_chegaram = metricas['agentes_no_farol']
                     # Recompensa base reduzida e escalonada
                     recompensa_base = 10.0
                     # Penalização por chegar depois (incentiva chegar primeiro)
@@ -187,35 +274,133 @@ class AmbienteFarol(Ambiente):
                     penalizacao_ordem = num_ja_chegaram * 1.0
                     recompensa = recompensa_base + bonus_primeiro - penalizacao_ordem
                     
-                    if agente_id not in self.metricas['tempos_chegada']:
-                        self.metricas['tempos_chegada'][agente_id] = self.passo_atual
-                        self.metricas['agentes_no_farol'] += 1
-            else:
-                # Penalização por movimento inválido (obstáculo/parede)
-                recompensa = -0.5  # Penalização maior para desencorajar
+                    metricas['tempos_chegada'][agente_id] = self.passo_atual
+                    metricas['agentes_no_farol'] = num_ja_chegaram + 1
+                    self._chegaram.add(agente_id)
 
         return recompensa
 
+    def agir_lote(self, deslocamentos: np.ndarray, agente_ids: List[str] = None) -> np.ndarray:
+        """
+        Executa um movimento de vários agentes numa só chamada vetorizada
+
+        Equivalente a chamar agir() com ações "mover" para cada agente, pela
+        ordem dada (a ordem só importa para a recompensa escalonada de chegada).
+
+        Args:
+            deslocamentos: Array (N, 2) com o (dx, dy) de cada agente
+            agente_ids: IDs distintos dos agentes (por omissão, todos pela ordem de registo)
+
+        Returns:
+            Array (N,) com as recompensas
+        """
+        if agente_ids is None:
+            agente_ids = list(self._indice_agente)
+        deslocamentos = np.asarray(deslocamentos, dtype=np.int32).reshape(-1, 2)
+        indices = np.fromiter((self._indice_agente[a] for a in agente_ids),
+                              dtype=np.intp, count=len(agente_ids))
+
+        farol_x, farol_y = self.pos_farol.x, self.pos_farol.y
+        ax = self.agentes_x[indices]
+        ay = self.agentes_y[indices]
+        nx = ax + deslocamentos[:, 0]
+        ny = ay + deslocamentos[:, 1]
+        ja_chegou = np.fromiter((a in self._chegaram for a in agente_ids),
+                                dtype=bool, count=len(agente_ids))
+
+        # Agentes que já chegaram: movem-se livremente com recompensas mínimas
+        estava_no_farol = (ax == farol_x) & (ay == farol_y)
+        fica_no_farol = (nx == farol_x) & (ny == farol_y)
+        moveu = (nx != ax) | (ny != ay)
+        recompensas_chegados = np.where(estava_no_farol & ~fica_no_farol, -0.1,
+                                        np.where(moveu, -0.01, 0.0))
+
+        # Restantes: validade via grid com borda (fora dos limites = obstáculo)
+        bx = np.clip(nx + 1, 0, self.largura + 1)
+        by = np.clip(ny + 1, 0, self.altura + 1)
+        valido = (self._grid_bordas[bx, by] & self.OBSTACULO) == 0
+        dist_antiga = np.abs(farol_x - ax) + np.abs(farol_y - ay)
+        dist_nova = np.abs(farol_x - nx) + np.abs(farol_y - ny)
+        recompensas_movimento = np.where(
+            valido,
+            np.where(dist_nova < dist_antiga, 2.0, np.where(dist_nova > dist_antiga, -1.0, -0.1)),
+            -0.5)
+
+        recompensas = np.where(ja_chegou, recompensas_chegados, recompensas_movimento)
+        moveu_agente = ja_chegou | valido
+
+        # Escrever posições (arrays SoA e dicionário de agentes)
+        self.agentes_x[indices[moveu_agente]] = nx[moveu_agente]
+        self.agentes_y[indices[moveu_agente]] = ny[moveu_agente]
+        for i in np.flatnonzero(moveu_agente).tolist():
+            agente = self.agentes[agente_ids[i]]
+            nova_pos = Posicao.obter(int(nx[i]), int(ny[i]))
+            agente['posicao'] = nova_pos
+            if not ja_chegou[i]:
+                agente['historico_posicoes'].append(nova_pos)
+
+        # Chegadas ao farol, processadas por ordem (recompensa escalonada)
+        for i in np.flatnonzero(~ja_chegou & valido & fica_no_farol).tolist():
+            num_ja_chegaram = self.metricas['agentes_no_farol']
+            bonus_primeiro = 5.0 if num_ja_chegaram == 0 else 0.0
+            recompensas[i] = 10.0 + bonus_primeiro - num_ja_chegaram * 1.0
+            self.metricas['tempos_chegada'][agente_ids[i]] = self.passo_atual
+            self.metricas['agentes_no_farol'] += 1
+            self._chegaram.add(agente_ids[i])
+
+        return recompensas
+
     def atualizacao(self):
         self.passo_atual += 1
 
-        # Atualizar métricas de distâncias médias
-        distancias = []
-        for agente_id, info in self.agentes.items():
-            pos = info['posicao']
-            distancias.append(pos.distancia(self.pos_farol))
-
-        if distancias:
-            self.metricas['distancias_medias'].append(np.mean(distancias))
+        # Atualizar métricas de distâncias médias (Manhattan)
+        num_agentes = len(self._indice_agente)
+        if 0 < num_agentes < self.LIMIAR_VETORIZACAO:
+            # Poucos agentes: aritmética de inteiros é mais rápida que ufuncs
+            fx, fy = self.pos_farol.x, self.pos_farol.y
+            total = 0
+            for info in self.agentes.values():
+                pos = info['posicao']
+                total += abs(pos.x - fx) + abs(pos.y - fy)
+            self._registar_distancia(total / num_agentes)
+        elif num_agentes:
+            # Vetorizado, em buffers de trabalho reutilizados entre passos
+            if self._tmp_dx.shape != self.agentes_x.shape:
+                self._tmp_dx = np.empty_like(self.agentes_x)
+                self._tmp_dy = np.empty_like(self.agentes_y)
+            dx, dy = self._tmp_dx, self._tmp_dy
+            np.subtract(self.agentes_x, self.pos_farol.x, out=dx)
+            np.abs(dx, out=dx)
+            np.subtract(self.agentes_y, self.pos_farol.y, out=dy)
+            np.abs(dy, out=dy)
+            np.add(dx, dy, out=dx)
+            self._registar_distancia(dx.mean())
 
         # Condição de terminação: todos os agentes no farol
         if (len(self.agentes) > 0 and
                 self.metricas['agentes_no_farol'] == len(self.agentes)):
             self.terminar_episodio()
 
+    def _registar_distancia(self, distancia: float):
+        """Acrescenta a distância média do passo ao buffer (e à vista nas métricas)"""
+        if self._num_distancias == len(self._distancias):
+            self._distancias = np.resize(self._distancias, 2 * len(self._distancias))
+        self._distancias[self._num_distancias] = distancia
+        self._num_distancias += 1
+        self.metricas['distancias_medias'] = self._distancias[:self._num_distancias]
+
+    def _reiniciar_distancias(self):
+        """Começa um buffer novo de distâncias (as vistas do episódio anterior não mudam)"""
+        self._distancias = np.empty(256, dtype=np.float64)
+        self._num_distancias = 0
+
     def reset(self):
         """Reinicia o ambiente para o estado inicial e move farol/obstáculos"""
         super().reset()
+        for agente_id, info in self.agentes.items():
+            self._atualizar_posicao(agente_id, info['posicao'])
+        # Ocupação dos agentes calculada uma vez para todo o reposicionamento
+        self._marcar_agentes()
         
         # Mover farol e obstáculos ao início de cada novo episódio
         if self.mover_farol:
@@ -230,8 +415,10 @@ class AmbienteFarol(Ambiente):
         self.ultimo_movimento = 0
         
         # Reinicializar métricas específicas do AmbienteFarol
+        self._chegaram.clear()
+        self._reiniciar_distancias()
         self.metricas.update({
             'agentes_no_farol': 0,
-            'distancias_medias': [],
-            'tempos_chegada': {}
+            'tempos_chegada': {},
+            'distancias_medias': self._distancias[:0]
         })
\ No newline at end of file
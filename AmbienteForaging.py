@@ -3,17 +3,196 @@ Ambiente de Foraging (Recoleção)
 Agentes recolhem recursos e depositam em ninhos
 """
 
-from ambiente import Ambiente, Posicao, Observacao, Direcao, Acao
-import random
-from typing import Dict, Set, List
+from ambiente import Ambiente, Posicao, Observacao, Direcao, Acao, njit
+import itertools
+import weakref
+from typing import Any, Dict, Set, List, Tuple, Optional
+from collections.abc import Mapping, Sequence
+import numpy as np
+
+
+def _chave(x: int, y: int) -> int:
+    """Empacota (x, y) num único int (16 bits por coordenada), como Posicao.__hash__"""
+    return ((x & 0xFFFF) << 16) | (y & 0xFFFF)
+
+
+@njit(cache=True)
+def _distancia_minima_manhattan(xy, px, py):
+    """Menor distância Manhattan de (px, py) aos pontos de xy (N, 2); inf se vazio"""
+    melhor = np.inf
+    for i in range(xy.shape[0]):
+        dist = abs(xy[i, 0] - px) + abs(xy[i, 1] - py)
+        if dist < melhor:
+            melhor = dist
+    return melhor
+
+
+@njit(cache=True)
+def _vizinhos_bloqueados(bloqueado, px, py):
+    """
+    Flags de bloqueio (N, S, E, O) à volta de (px, py), lidas do grid com borda
+
+    Coordenadas fora do grid com borda são encostadas à borda (bloqueada),
+    pelo que agentes fora dos limites não precisam de um caminho à parte.
+    """
+    max_x = bloqueado.shape[0] - 1
+    max_y = bloqueado.shape[1] - 1
+    x_centro = min(max(px + 1, 0), max_x)
+    y_centro = min(max(py + 1, 0), max_y)
+    x_este = min(max(px + 2, 0), max_x)
+    x_oeste = min(max(px, 0), max_x)
+    y_norte = min(max(py, 0), max_y)
+    y_sul = min(max(py + 2, 0), max_y)
+    return (bool(bloqueado[x_centro, y_norte]), bool(bloqueado[x_centro, y_sul]),
+            bool(bloqueado[x_este, y_centro]), bool(bloqueado[x_oeste, y_centro]))
+
+
+class ProximosForaging(Sequence):
+    """
+    Lista só de leitura de recursos/ninhos próximos guardada num array int32
+
+    Cada linha é [x, y, *campos]; os elementos são materializados como os
+    dicionários {'posicao': (x, y), campo: valor, ...} apenas quando acedidos.
+    """
+
+    __slots__ = ('linhas', 'campos')
+
+    def __init__(self, linhas: np.ndarray, campos: Tuple[str, ...]):
+        self.linhas = linhas
+        self.campos = campos
+
+    def _para_dict(self, linha: list) -> Dict:
+        item = {'posicao': (linha[0], linha[1])}
+        item.update(zip(self.campos, linha[2:]))
+        return item
+
+    def __getitem__(self, indice):
+        if isinstance(indice, slice):
+            return [self._para_dict(linha) for linha in self.linhas[indice].tolist()]
+        return self._para_dict(self.linhas[indice].tolist())
+
+    def __iter__(self):
+        return (self._para_dict(linha) for linha in self.linhas.tolist())
+
+    def __len__(self) -> int:
+        return len(self.linhas)
+
+    def para_dicts(self) -> List[Dict]:
+        """Materializa todos os elementos como lista de dicionários"""
+        return list(self)
+
+    def __repr__(self):
+        return repr(self.para_dicts())
+
+
+class DadosForaging(Mapping):
+    """
+    Observação do Foraging com os campos de vizinhança calculados a pedido
+
+    Posição, carga e pode_recolher/pode_depositar são fixados na criação;
+    recursos_proximos, ninhos_proximos e obstaculos_vizinhos só são
+    calculados no primeiro acesso (ou quando o ambiente os fixa antes de
+    alterar recursos, ninhos ou obstáculos). Expõe as mesmas chaves (só de
+    leitura) que o antigo dicionário de dados.
+    """
+
+    __slots__ = ('ambiente', 'px', 'py', 'recursos_carregados', 'pode_recolher',
+                 'pode_depositar', '_recursos_proximos', '_ninhos_proximos',
+                 '_obstaculos_vizinhos', '__weakref__')
+
+    _CHAVES = ('posicao_atual', 'recursos_proximos', 'ninhos_proximos',
+               'obstaculos_vizinhos', 'recursos_carregados', 'pode_recolher',
+               'pode_depositar')
+
+    def __init__(self, ambiente: 'AmbienteForaging', px: int, py: int,
+                 recursos_carregados: int, pode_recolher: bool, pode_depositar: bool):
+        self.ambiente = ambiente
+        self.px = px
+        self.py = py
+        self.recursos_carregados = recursos_carregados
+        self.pode_recolher = pode_recolher
+        self.pode_depositar = pode_depositar
+        self._recursos_proximos = None
+        self._ninhos_proximos = None
+        self._obstaculos_vizinhos = None
+
+    @property
+    def recursos_proximos(self) -> ProximosForaging:
+        if self._recursos_proximos is None:
+            self._recursos_proximos = self.ambiente._observar_recursos(self.px, self.py)
+        return self._recursos_proximos
+
+    @property
+    def ninhos_proximos(self) -> ProximosForaging:
+        if self._ninhos_proximos is None:
+            self._ninhos_proximos = self.ambiente._observar_ninhos(self.px, self.py)
+        return self._ninhos_proximos
+
+    @property
+    def obstaculos_vizinhos(self) -> Dict[str, bool]:
+        if self._obstaculos_vizinhos is None:
+            self._obstaculos_vizinhos = dict(zip(
+                AmbienteForaging._NOMES_VIZINHOS,
+                _vizinhos_bloqueados(self.ambiente._bloqueado, self.px, self.py)))
+        return self._obstaculos_vizinhos
+
+    def fixar(self):
+        """Calcula já os campos pendentes (o ambiente vai ser alterado)"""
+        self.recursos_proximos
+        self.ninhos_proximos
+        self.obstaculos_vizinhos
+
+    def __getitem__(self, chave: str) -> Any:
+        if chave == 'posicao_atual':
+            return self.px, self.py
+        if chave in self._CHAVES:
+            return getattr(self, chave)
+        raise KeyError(chave)
+
+    def __contains__(self, chave) -> bool:
+        return chave in self._CHAVES
+
+    def __iter__(self):
+        return iter(self._CHAVES)
+
+    def __len__(self) -> int:
+        return len(self._CHAVES)
+
+    def para_dict(self) -> Dict[str, Any]:
+        """Materializa a observação como dicionário (p.ex. para serializar)"""
+        dados = dict(self)
+        dados['recursos_proximos'] = dados['recursos_proximos'].para_dicts()
+        dados['ninhos_proximos'] = dados['ninhos_proximos'].para_dicts()
+        return dados
+
+    def __repr__(self):
+        return repr(dict(self))
 
 
 class AmbienteForaging(Ambiente):
     """Ambiente de recolha de recursos (Foraging)"""
+
+    # Abaixo deste número de pontos a pesquisa em Python puro é mais rápida
+    _LIMIAR_VETORIZACAO = 8
+    # Lado (em células) dos baldes do índice espacial de recursos
+    _TAMANHO_BALDE = 2
+    # Número de observações pendentes a partir do qual se limpam as já libertadas
+    _MAX_VISTAS_PENDENTES = 64
+
+    # Recompensas de movimento indexadas pelo sinal da aproximação + 1:
+    # (afastou-se, mesma distância, aproximou-se)
+    _RECOMPENSAS_PARA_NINHO = (-0.2, 0.01, 0.5)
+    _RECOMPENSAS_PARA_RECURSO = (-0.1, 0.01, 0.5)
+
+    # Deslocamento (dx, dy) de cada direção, sem passar por Direcao.value
+    _DESLOCAMENTOS = {direcao: direcao.value for direcao in Direcao}
+
+    # Chaves de obstaculos_vizinhos, pela ordem devolvida por _vizinhos_bloqueados
+    _NOMES_VIZINHOS = (Direcao.NORTE.name, Direcao.SUL.name, Direcao.ESTE.name, Direcao.OESTE.name)
     
     def __init__(self, largura: int = 15, altura: int = 15,
                  num_recursos: int = 20, num_ninhos: int = 1,
-                 com_obstaculos: bool = False):
+                 com_obstaculos: bool = False, seed: Optional[int] = None):
         super().__init__(largura, altura)
         
         # Recursos: posição -> valor
@@ -23,7 +202,45 @@ class AmbienteForaging(Ambiente):
         # Ninhos (pontos de entrega)
         self.ninhos: List[Posicao] = []
         self.num_ninhos = num_ninhos
+
+        # Índice espacial de recursos: balde (x // T, y // T) -> posições,
+        # mantido em sincronia com self.recursos; a ordem de inserção permite
+        # devolver os vizinhos pela mesma ordem do dicionário
+        self._baldes_recursos: Dict[Tuple[int, int], List[Posicao]] = {}
+        self._ordem_recursos: Dict[int, int] = {}  # chave empacotada -> ordem
+        self._contador_recursos = itertools.count()
+
+        # Coordenadas dos ninhos num array (N, 2), pela ordem de self.ninhos
+        self._nin_xy = np.empty((0, 2), dtype=np.int32)
+
+        # Versões de recursos/ninhos: invalidam as distâncias mínimas em cache
+        # guardadas por agente (ver _distancia_minima)
+        self._versao_recursos = 0
+        self._versao_ninhos = 0
         
+        # Ninhos também por chave empacotada (ver _chave), usada nos testes
+        # de pertença do caminho crítico em vez de objetos Posicao
+        self._chaves_ninhos: Set[int] = set()
+
+        # Máscara de células bloqueadas indexada por [x + 1, y + 1]: a borda
+        # (fora dos limites) e os obstáculos ficam True, pelo que validar uma
+        # posição é um único acesso ao array
+        self._bloqueado = np.ones((largura + 2, altura + 2), dtype=bool)
+        self._bloqueado[1:-1, 1:-1] = False
+
+        # Gerador aleatório persistente (sorteios em lote); seed torna a
+        # geração de recursos, ninhos e obstáculos reprodutível
+        self.rng = np.random.default_rng(seed)
+
+        # Observações com campos ainda por calcular (ver DadosForaging)
+        self._vistas_pendentes: List[weakref.ref] = []
+
+        # Índices planos (x * altura + y) das células de borda, candidatas a ninho
+        borda = np.zeros((largura, altura), dtype=bool)
+        borda[[0, -1], :] = True
+        borda[:, [0, -1]] = True
+        self._celulas_borda = np.flatnonzero(borda)
+
         # Obstáculos
         self.obstaculos: Set[Posicao] = set()
         self.com_obstaculos = com_obstaculos
@@ -42,214 +259,402 @@ class AmbienteForaging(Ambiente):
             'tempo_medio_coleta': 0
         })
     
-    def _obter_posicoes_ocupadas(self) -> Set[Posicao]:
-        """Retorna conjunto de posições ocupadas (recursos + ninhos + agentes)"""
-        ocupadas = set()
-        ocupadas.update(self.recursos.keys())
-        ocupadas.update(self.ninhos)
-        for agente_id, info in self.agentes.items():
-            ocupadas.add(info['posicao'])
+    def _mascara_ocupadas(self) -> np.ndarray:
+        """Máscara (largura, altura) das células com recurso, ninho ou agente"""
+        ocupadas = np.zeros((self.largura, self.altura), dtype=bool)
+        for xy in (self._coordenadas(self.recursos), self._nin_xy, self._coordenadas(
+                [info['posicao'] for info in self.agentes.values()])):
+            xs, ys = xy[:, 0], xy[:, 1]
+            dentro = (xs >= 0) & (xs < self.largura) & (ys >= 0) & (ys < self.altura)
+            ocupadas[xs[dentro], ys[dentro]] = True
         return ocupadas
+
+    def _sortear_celulas_livres(self, ocupadas: np.ndarray, quantidade: int):
+        """Sorteia sem repetição até `quantidade` células livres numa só chamada"""
+        livres = np.flatnonzero(~ocupadas)
+        escolhidas = self.rng.choice(livres, size=min(quantidade, livres.size), replace=False)
+        return np.divmod(escolhidas, self.altura)
     
     def _gerar_obstaculos(self):
         """Gera obstáculos aleatórios, evitando recursos, ninhos e agentes"""
-        posicoes_ocupadas = self._obter_posicoes_ocupadas()
+        # Não há verificação de conectividade (BFS) aos ninhos: a densidade é
+        # baixa (1/15 das células) e a colocação é um único sorteio
         num_obstaculos = (self.largura * self.altura) // 15
-        tentativas = 0
-        max_tentativas = num_obstaculos * 10
-        
+        xs, ys = self._sortear_celulas_livres(self._mascara_ocupadas(), num_obstaculos)
+
+        self._fixar_vistas()
+        self._bloqueado[1:-1, 1:-1] = False
+        self._bloqueado[xs + 1, ys + 1] = True
         self.obstaculos.clear()
-        while len(self.obstaculos) < num_obstaculos and tentativas < max_tentativas:
-            x = random.randint(0, self.largura - 1)
-            y = random.randint(0, self.altura - 1)
-            pos = Posicao(x, y)
-            if pos not in posicoes_ocupadas:
-                self.obstaculos.add(pos)
-            tentativas += 1
+        self.obstaculos.update(Posicao(x, y) for x, y in zip(xs.tolist(), ys.tolist()))
+
+    def _esta_bloqueado(self, x: int, y: int) -> bool:
+        """True se (x, y) estiver fora dos limites ou tiver um obstáculo"""
+        # Coordenadas fora do grid com borda são encostadas à borda (bloqueada)
+        bx = min(max(x + 1, 0), self.largura + 1)
+        by = min(max(y + 1, 0), self.altura + 1)
+        return bool(self._bloqueado[bx, by])
     
     def _gerar_recursos(self):
         """Gera recursos aleatórios no ambiente"""
+        self._fixar_vistas()
         self.recursos.clear()
-        for _ in range(self.num_recursos):
-            tentativas = 0
-            while tentativas < 100:
-                x = random.randint(0, self.largura - 1)
-                y = random.randint(0, self.altura - 1)
-                pos = Posicao(x, y)
-                
-                # Verificar se posição é válida (não é obstáculo, não tem recurso)
-                if (pos not in self.obstaculos and 
-                    pos not in self.recursos and
-                    pos not in self.ninhos):
-                    # Valor aleatório entre 1 e 5
-                    self.recursos[pos] = random.randint(1, 5)
-                    break
-                tentativas += 1
+        self._baldes_recursos.clear()
+        self._ordem_recursos.clear()
+        self._versao_recursos += 1
+
+        # Células livres: sem obstáculo e sem ninho
+        ocupadas = self._bloqueado[1:-1, 1:-1].copy()
+        for ninho in self.ninhos:
+            ocupadas[ninho.x, ninho.y] = True
+
+        xs, ys = self._sortear_celulas_livres(ocupadas, self.num_recursos)
+        # Valor aleatório entre 1 e 5
+        valores = self.rng.integers(1, 6, size=len(xs))
+        for x, y, valor in zip(xs.tolist(), ys.tolist(), valores.tolist()):
+            self._adicionar_recurso(Posicao(x, y), valor)
+
+    @staticmethod
+    def _coordenadas(posicoes: List[Posicao]) -> np.ndarray:
+        """Converte uma lista de posições num array (N, 2) de int32"""
+        xy = np.fromiter((c for p in posicoes for c in (p.x, p.y)),
+                         dtype=np.int32, count=2 * len(posicoes))
+        return xy.reshape(-1, 2)
+
+    def _adicionar_recurso(self, pos: Posicao, valor: int):
+        """Coloca um recurso e indexa-o no seu balde"""
+        self._fixar_vistas()
+        self.recursos[pos] = valor
+        self._ordem_recursos[_chave(pos.x, pos.y)] = next(self._contador_recursos)
+        self._versao_recursos += 1
+        balde = (pos.x // self._TAMANHO_BALDE, pos.y // self._TAMANHO_BALDE)
+        self._baldes_recursos.setdefault(balde, []).append(pos)
+
+    def _remover_recurso(self, pos: Posicao):
+        """Retira um recurso do dicionário e do índice espacial"""
+        self._fixar_vistas()
+        del self.recursos[pos]
+        del self._ordem_recursos[_chave(pos.x, pos.y)]
+        self._versao_recursos += 1
+        balde = (pos.x // self._TAMANHO_BALDE, pos.y // self._TAMANHO_BALDE)
+        posicoes = self._baldes_recursos[balde]
+        posicoes.remove(pos)
+        if not posicoes:
+            del self._baldes_recursos[balde]
+
+    def _recursos_proximos(self, origem: Posicao, raio: int) -> List[Tuple[Posicao, int]]:
+        """Recursos a distância Manhattan <= raio, pela ordem de self.recursos"""
+        T = self._TAMANHO_BALDE
+        baldes = self._baldes_recursos
+        ox, oy = origem.x, origem.y
+        encontrados = []
+        for bx in range((ox - raio) // T, (ox + raio) // T + 1):
+            for by in range((oy - raio) // T, (oy + raio) // T + 1):
+                for pos in baldes.get((bx, by), ()):
+                    # Distância Manhattan em linha (sem chamada a Posicao.distancia)
+                    dist = abs(ox - pos.x) + abs(oy - pos.y)
+                    if dist <= raio:
+                        encontrados.append((pos, dist))
+        if len(encontrados) > 1:
+            ordem = self._ordem_recursos
+            encontrados.sort(key=lambda par: ordem[_chave(par[0].x, par[0].y)])
+        return encontrados
+
+    def _distancia_recurso_mais_proximo(self, origem: Posicao) -> float:
+        """Distância Manhattan ao recurso mais próximo (inf se não houver recursos)"""
+        if not self.recursos:
+            return float('inf')
+
+        T = self._TAMANHO_BALDE
+        baldes = self._baldes_recursos
+        ox, oy = origem.x, origem.y
+        cx, cy = ox // T, oy // T
+        ultimo_x, ultimo_y = (self.largura - 1) // T, (self.altura - 1) // T
+        max_anel = max(abs(cx), abs(ultimo_x - cx), abs(cy), abs(ultimo_y - cy))
+
+        # Percorre anéis de baldes à volta da origem; um balde no anel k está
+        # a pelo menos (k - 1) * T + 1 células, o que permite parar cedo
+        melhor = float('inf')
+        for anel in range(max_anel + 1):
+            if anel > 0 and (anel - 1) * T + 1 > melhor:
+                break
+            for bx in range(cx - anel, cx + anel + 1):
+                passo_y = 1 if bx in (cx - anel, cx + anel) else 2 * anel
+                for by in range(cy - anel, cy + anel + 1, max(passo_y, 1)):
+                    for pos in baldes.get((bx, by), ()):
+                        dist = abs(ox - pos.x) + abs(oy - pos.y)
+                        if dist < melhor:
+                            melhor = dist
+        return melhor
+
+    def _proximos(self, posicoes: List[Posicao], xy: np.ndarray,
+                  origem: Posicao, raio: int) -> List[Tuple[Posicao, int]]:
+        """Posições (por ordem) a distância Manhattan <= raio da origem, com a distância"""
+        if len(posicoes) < self._LIMIAR_VETORIZACAO:
+            ox, oy = origem.x, origem.y
+            proximos = []
+            for pos in posicoes:
+                dist = abs(ox - pos.x) + abs(oy - pos.y)
+                if dist <= raio:
+                    proximos.append((pos, dist))
+            return proximos
+
+        distancias = np.abs(xy[:, 0] - origem.x) + np.abs(xy[:, 1] - origem.y)
+        indices = np.flatnonzero(distancias <= raio)
+        return [(posicoes[i], d) for i, d in zip(indices.tolist(), distancias[indices].tolist())]
     
     def _gerar_ninhos(self):
         """Gera ninhos (pontos de entrega)"""
+        self._fixar_vistas()
         self.ninhos.clear()
-        for _ in range(self.num_ninhos):
-            tentativas = 0
-            while tentativas < 100:
-                # Ninhos geralmente nas bordas
-                if random.random() < 0.5:
-                    # Borda vertical
-                    x = random.choice([0, self.largura - 1])
-                    y = random.randint(0, self.altura - 1)
-                else:
-                    # Borda horizontal
-                    x = random.randint(0, self.largura - 1)
-                    y = random.choice([0, self.altura - 1])
-                
-                pos = Posicao(x, y)
-                
-                if (pos not in self.obstaculos and 
-                    pos not in self.recursos and
-                    pos not in self.ninhos):
-                    self.ninhos.append(pos)
-                    break
-                tentativas += 1
+        self._chaves_ninhos.clear()
+        # Ninhos nas bordas: sorteio sem repetição entre as células de borda
+        # sem obstáculo nem recurso
+        ocupadas = self._bloqueado[1:-1, 1:-1].copy()
+        recursos_xy = self._coordenadas(self.recursos)
+        ocupadas[recursos_xy[:, 0], recursos_xy[:, 1]] = True
+        livres = self._celulas_borda[~ocupadas.ravel()[self._celulas_borda]]
+        escolhidas = self.rng.choice(livres, size=min(self.num_ninhos, livres.size), replace=False)
+        for x, y in zip(*(c.tolist() for c in np.divmod(escolhidas, self.altura))):
+            self.ninhos.append(Posicao(x, y))
+            self._chaves_ninhos.add(_chave(x, y))
         
         # Se não conseguiu gerar, colocar no centro
         if not self.ninhos:
             centro = Posicao(self.largura // 2, self.altura // 2)
             self.ninhos.append(centro)
+            self._chaves_ninhos.add(_chave(centro.x, centro.y))
+        self._nin_xy = self._coordenadas(self.ninhos)
+        self._versao_ninhos += 1
+
+    def _distancia_minima(self, agente_info: Dict, alvo: str, pos: Posicao) -> float:
+        """
+        Distância ao ninho ('ninho') ou recurso ('recurso') mais próximo de pos
+
+        O último valor calculado fica em cache no agente e é reutilizado
+        enquanto a posição e os recursos/ninhos não mudarem, pelo que a
+        distância da posição anterior de um movimento não é recalculada.
+        """
+        chave = 'cache_dist_' + alvo
+        versao = self._versao_ninhos if alvo == 'ninho' else self._versao_recursos
+        cache = agente_info.get(chave)
+        if cache is not None and cache[1] == versao and cache[0] == pos:
+            return cache[2]
+
+        if alvo == 'ninho':
+            dist = float(_distancia_minima_manhattan(self._nin_xy, pos.x, pos.y))
+        else:
+            dist = self._distancia_recurso_mais_proximo(pos)
+        agente_info[chave] = (pos, versao, dist)
+        return dist
     
+    def _observar_recursos(self, px: int, py: int) -> ProximosForaging:
+        """Recursos visíveis a partir de (px, py) (visão limitada)"""
+        linhas = [(recurso_pos.x, recurso_pos.y, self.recursos[recurso_pos], dist)
+                  for recurso_pos, dist in self._recursos_proximos(Posicao.obter(px, py), 2)]
+        return ProximosForaging(np.array(linhas, dtype=np.int32).reshape(-1, 4),
+                                ('valor', 'distancia'))
+
+    def _observar_ninhos(self, px: int, py: int) -> ProximosForaging:
+        """Ninhos visíveis a partir de (px, py)"""
+        linhas = [(ninho_pos.x, ninho_pos.y, dist)
+                  for ninho_pos, dist in self._proximos(self.ninhos, self._nin_xy,
+                                                        Posicao.obter(px, py), 3)]
+        return ProximosForaging(np.array(linhas, dtype=np.int32).reshape(-1, 3),
+                                ('distancia',))
+
+    def _fixar_vistas(self):
+        """Calcula os campos pendentes das observações vivas antes de alterar o estado"""
+        if self._vistas_pendentes:
+            for ref in self._vistas_pendentes:
+                dados = ref()
+                if dados is not None:
+                    dados.fixar()
+            self._vistas_pendentes.clear()
+
     def observacao_para(self, agente_id: str) -> Observacao:
         """Retorna observação para o agente"""
         pos_agente = self.obter_posicao_agente(agente_id)
         if not pos_agente:
             return Observacao({}, agente_id)
         
-        # Detectar recursos próximos
-        recursos_proximos = []
-        for recurso_pos, valor in self.recursos.items():
-            dist = pos_agente.distancia(recurso_pos)
-            if dist <= 2:  # Visão limitada
-                recursos_proximos.append({
-                    'posicao': (recurso_pos.x, recurso_pos.y),
-                    'valor': valor,
-                    'distancia': dist
-                })
-        
-        # Detectar ninhos próximos
-        ninhos_proximos = []
-        for ninho_pos in self.ninhos:
-            dist = pos_agente.distancia(ninho_pos)
-            if dist <= 3:
-                ninhos_proximos.append({
-                    'posicao': (ninho_pos.x, ninho_pos.y),
-                    'distancia': dist
-                })
-        
-        # Detectar obstáculos vizinhos
-        obstaculos_vizinhos = {}
-        for direcao in [Direcao.NORTE, Direcao.SUL, Direcao.ESTE, Direcao.OESTE]:
-            pos_vizinha = pos_agente.mover(direcao)
-            obstaculos_vizinhos[direcao.name] = (
-                not self.posicao_valida(pos_vizinha) or
-                pos_vizinha in self.obstaculos
-            )
+        px, py = pos_agente.x, pos_agente.y
+        chave_agente = _chave(px, py)
         
         # Recursos carregados pelo agente
         recursos_carregados = self.agentes[agente_id].get('recursos', 0)
         
-        dados_obs = {
-            'posicao_atual': (pos_agente.x, pos_agente.y),
-            'recursos_proximos': recursos_proximos,
-            'ninhos_proximos': ninhos_proximos,
-            'obstaculos_vizinhos': obstaculos_vizinhos,
-            'recursos_carregados': recursos_carregados,
-            'pode_recolher': pos_agente in self.recursos,
-            'pode_depositar': pos_agente in self.ninhos and recursos_carregados > 0
-        }
+        # Recursos/ninhos próximos e obstáculos vizinhos são calculados a pedido
+        dados_obs = DadosForaging(
+            self, px, py, recursos_carregados,
+            pode_recolher=chave_agente in self._ordem_recursos,
+            pode_depositar=chave_agente in self._chaves_ninhos and recursos_carregados > 0)
+        pendentes = self._vistas_pendentes
+        if len(pendentes) >= self._MAX_VISTAS_PENDENTES:
+            # Descarta as observações já libertadas pelos agentes
+            pendentes[:] = [ref for ref in pendentes if ref() is not None]
+        pendentes.append(weakref.ref(dados_obs))
         
         return Observacao(dados_obs, agente_id)
     
     def agir(self, accao: Acao, agente_id: str) -> float:
         """Executa ação do agente"""
-        if agente_id not in self.agentes:
+        agente_info = self.agentes.get(agente_id)
+        if agente_info is None:
             return 0.0
-        
-        agente_info = self.agentes[agente_id]
+
+        # Despacho por tabela em vez de uma cadeia de comparações de strings
+        executar = self._ACOES.get(accao.tipo)
+        if executar is None:
+            return 0.0
+        return executar(self, accao, agente_info)
+
+    def _agir_mover(self, accao: Acao, agente_info: Dict) -> float:
+        """Move o agente; recompensa orientada para recurso ou ninho"""
         pos_atual = agente_info['posicao']
-        recompensa = 0.0
+        dx, dy = self._DESLOCAMENTOS[accao.direcao]
+        nx, ny = pos_atual.x + dx, pos_atual.y + dy
         
-        if accao.tipo == "mover":
-            direcao = accao.parametros.get('direcao', Direcao.PARADO)
-            nova_pos = pos_atual.mover(direcao)
+        # Verificar se movimento é válido
+        if not self._esta_bloqueado(nx, ny):
+            nova_pos = Posicao.obter(nx, ny)
+            agente_info['posicao'] = nova_pos
+            agente_info['historico_posicoes'].append(nova_pos)
             
-            # Verificar se movimento é válido
-            if (self.posicao_valida(nova_pos) and
-                    nova_pos not in self.obstaculos):
-                agente_info['posicao'] = nova_pos
-                agente_info['historico_posicoes'].append(nova_pos)
-                
-                recursos_carregados = agente_info.get('recursos', 0)
-                
-                # Recompensa baseada no objetivo do agente
-                # Se tem recurso, deve ir para ninho; se não tem, deve ir para recurso
-                if recursos_carregados > 0:
-                    # Tem recurso: recompensa maior se está se aproximando de um ninho
-                    dist_ninho_min = min([pos_atual.distancia(ninho) for ninho in self.ninhos], default=float('inf'))
-                    dist_ninho_nova = min([nova_pos.distancia(ninho) for ninho in self.ninhos], default=float('inf'))
-                    if dist_ninho_nova < dist_ninho_min:
-                        recompensa = 0.5  # Recompensa por aproximar-se do ninho
-                    elif dist_ninho_nova > dist_ninho_min:
-                        recompensa = -0.2  # Penalização por afastar-se do ninho
-                    else:
-                        recompensa = 0.01  # Pequena recompensa por movimento
-                else:
-                    # Não tem recurso: recompensa maior se está se aproximando de um recurso
-                    if self.recursos:
-                        dist_recurso_min = min([pos_atual.distancia(recurso) for recurso in self.recursos.keys()], default=float('inf'))
-                        dist_recurso_nova = min([nova_pos.distancia(recurso) for recurso in self.recursos.keys()], default=float('inf'))
-                        if dist_recurso_nova < dist_recurso_min:
-                            recompensa = 0.5  # Recompensa por aproximar-se de recurso
-                        elif dist_recurso_nova > dist_recurso_min:
-                            recompensa = -0.1  # Pequena penalização por afastar-se
-                        else:
-                            recompensa = 0.01  # Pequena recompensa por movimento
-                    else:
-                        # Sem recursos disponíveis, recompensa mínima
-                        recompensa = 0.01
+            recursos_carregados = agente_info.get('recursos', 0)
+            
+            # Recompensa baseada no objetivo do agente
+            # Se tem recurso, deve ir para ninho; se não tem, deve ir para recurso
+            if recursos_carregados > 0:
+                # Tem recurso: recompensa maior se está se aproximando de um ninho
+                aproximacao = (self._distancia_minima(agente_info, 'ninho', pos_atual) -
+                               self._distancia_minima(agente_info, 'ninho', nova_pos))
+                recompensa = self._RECOMPENSAS_PARA_NINHO[(aproximacao > 0) - (aproximacao < 0) + 1]
             else:
-                recompensa = -0.1  # Penalização por movimento inválido
-        
-        elif accao.tipo == "recolher":
-            # Recolher recurso na posição atual
-            if pos_atual in self.recursos:
-                valor = self.recursos[pos_atual]
-                recursos_carregados = agente_info.get('recursos', 0)
-                
-                # Agente pode carregar apenas 1 recurso por vez
-                if recursos_carregados == 0:
-                    agente_info['recursos'] = valor
-                    del self.recursos[pos_atual]
-                    recompensa = 2.0  # Recompensa por recolher
-                    self.metricas['recursos_coletados'] += 1
+                # Não tem recurso: recompensa maior se está se aproximando de um recurso
+                if self.recursos:
+                    aproximacao = (self._distancia_minima(agente_info, 'recurso', pos_atual) -
+                                   self._distancia_minima(agente_info, 'recurso', nova_pos))
+                    recompensa = self._RECOMPENSAS_PARA_RECURSO[(aproximacao > 0) - (aproximacao < 0) + 1]
                 else:
-                    recompensa = -0.5  # Penalização: já tem recurso
+                    # Sem recursos disponíveis, recompensa mínima
+                    recompensa = 0.01
+        else:
+            recompensa = -0.1  # Penalização por movimento inválido
+
+        return recompensa
+
+    def _agir_recolher(self, accao: Acao, agente_info: Dict) -> float:
+        """Recolhe o recurso na posição atual do agente"""
+        pos_atual = agente_info['posicao']
+        # Recolher recurso na posição atual
+        if _chave(pos_atual.x, pos_atual.y) in self._ordem_recursos:
+            valor = self.recursos[pos_atual]
+            recursos_carregados = agente_info.get('recursos', 0)
+            
+            # Agente pode carregar apenas 1 recurso por vez
+            if recursos_carregados == 0:
+                agente_info['recursos'] = valor
+                self._remover_recurso(pos_atual)
+                recompensa = 2.0  # Recompensa por recolher
+                self.metricas['recursos_coletados'] += 1
             else:
-                recompensa = -0.2  # Penalização: não há recurso aqui
-        
-        elif accao.tipo == "depositar":
-            # Depositar recurso no ninho
-            if pos_atual in self.ninhos:
-                recursos_carregados = agente_info.get('recursos', 0)
-                if recursos_carregados > 0:
-                    valor = recursos_carregados
-                    agente_info['recursos'] = 0
-                    recompensa = 5.0 + valor  # Recompensa base + valor do recurso
-                    self.metricas['recursos_depositados'] += 1
-                    self.metricas['valor_total_depositado'] += valor
-                else:
-                    recompensa = -0.3  # Penalização: não tem recurso para depositar
+                recompensa = -0.5  # Penalização: já tem recurso
+        else:
+            recompensa = -0.2  # Penalização: não há recurso aqui
+
+        return recompensa
+
+    def _agir_depositar(self, accao: Acao, agente_info: Dict) -> float:
+        """Deposita o recurso carregado se o agente estiver num ninho"""
+        pos_atual = agente_info['posicao']
+        # Depositar recurso no ninho
+        if _chave(pos_atual.x, pos_atual.y) in self._chaves_ninhos:
+            recursos_carregados = agente_info.get('recursos', 0)
+            if recursos_carregados > 0:
+                valor = recursos_carregados
+                agente_info['recursos'] = 0
+                recompensa = 5.0 + valor  # Recompensa base + valor do recurso
+                self.metricas['recursos_depositados'] += 1
+                self.metricas['valor_total_depositado'] += valor
             else:
-                recompensa = -0.2  # Penalização: não está no ninho
-        
+                recompensa = -0.3  # Penalização: não tem recurso para depositar
+        else:
+            recompensa = -0.2  # Penalização: não está no ninho
+
         return recompensa
+
+    # Tipo de ação -> método que a executa
+    _ACOES = {
+        "mover": _agir_mover,
+        "recolher": _agir_recolher,
+        "depositar": _agir_depositar,
+    }
+    
+    @staticmethod
+    def _distancias_minimas(xs: np.ndarray, ys: np.ndarray, alvos_xy: np.ndarray) -> np.ndarray:
+        """Distância Manhattan mínima de cada (x, y) aos alvos, numa matriz (A, R)"""
+        if len(alvos_xy) == 0:
+            return np.full(len(xs), np.inf)
+        distancias = (np.abs(xs[:, None] - alvos_xy[None, :, 0]) +
+                      np.abs(ys[:, None] - alvos_xy[None, :, 1]))
+        return distancias.min(axis=1)
+
+    def agir_lote(self, deslocamentos: np.ndarray, agente_ids: List[str] = None) -> np.ndarray:
+        """
+        Executa um movimento de vários agentes numa só chamada vetorizada
+
+        Equivalente a chamar agir() com ações "mover" para cada agente (mover
+        não altera recursos nem ninhos, pelo que a ordem não importa).
+
+        Args:
+            deslocamentos: Array (N, 2) com o (dx, dy) de cada agente
+            agente_ids: IDs distintos dos agentes (por omissão, todos pela ordem de registo)
+
+        Returns:
+            Array (N,) com as recompensas
+        """
+        if agente_ids is None:
+            agente_ids = list(self.agentes)
+        deslocamentos = np.asarray(deslocamentos, dtype=np.int32).reshape(-1, 2)
+        infos = [self.agentes[a] for a in agente_ids]
+
+        ax, ay = self._coordenadas([info['posicao'] for info in infos]).T
+        nx = ax + deslocamentos[:, 0]
+        ny = ay + deslocamentos[:, 1]
+        carrega = np.fromiter((info.get('recursos', 0) > 0 for info in infos),
+                              dtype=bool, count=len(infos))
+
+        # Validade via máscara com borda (fora dos limites = bloqueado)
+        bx = np.clip(nx + 1, 0, self.largura + 1)
+        by = np.clip(ny + 1, 0, self.altura + 1)
+        valido = ~self._bloqueado[bx, by]
+
+        # Sinal da aproximação ao ninho (quem carrega) ou ao recurso (quem procura)
+        aproximacao = np.zeros(len(infos))
+        if carrega.any():
+            aproximacao[carrega] = (self._distancias_minimas(ax[carrega], ay[carrega], self._nin_xy) -
+                                    self._distancias_minimas(nx[carrega], ny[carrega], self._nin_xy))
+        procura = ~carrega
+        if self.recursos and procura.any():
+            recursos_xy = self._coordenadas(self.recursos)
+            aproximacao[procura] = (self._distancias_minimas(ax[procura], ay[procura], recursos_xy) -
+                                    self._distancias_minimas(nx[procura], ny[procura], recursos_xy))
+        indice = np.sign(aproximacao).astype(np.intp) + 1
+
+        recompensas = np.where(
+            carrega,
+            np.take(self._RECOMPENSAS_PARA_NINHO, indice),
+            np.take(self._RECOMPENSAS_PARA_RECURSO, indice) if self.recursos else 0.01)
+        recompensas = np.where(valido, recompensas, -0.1)  # Penalização por movimento inválido
+
+        for info, x, y in zip((info for info, v in zip(infos, valido.tolist()) if v),
+                              nx[valido].tolist(), ny[valido].tolist()):
+            nova_pos = Posicao.obter(x, y)
+            info['posicao'] = nova_pos
+            info['historico_posicoes'].append(nova_pos)
+
+        return recompensas
     
     def atualizacao(self):
         """Atualiza o ambiente"""
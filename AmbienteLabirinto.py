@@ -3,21 +3,146 @@ Ambiente de Labirinto
 Agentes devem encontrar o caminho do início ao fim
 """
 
-from ambiente import Ambiente, Posicao, Observacao, Direcao, Acao
-import random
-from typing import Set, List, Dict, Tuple
+from ambiente import Ambiente, Posicao, Observacao, Direcao, Acao, njit
+from typing import FrozenSet, List, Dict, Tuple, Optional
+import numpy as np
+
+
+# Deslocamentos (dx, dy) pela ordem NORTE, SUL, ESTE, OESTE
+_DESLOCAMENTOS_VIZINHOS = np.array([d.value for d in (Direcao.NORTE, Direcao.SUL,
+                                                      Direcao.ESTE, Direcao.OESTE)],
+                                   dtype=np.int64)
+
+
+@njit(cache=True)
+def _paredes_vizinhas(paredes_borda, px, py):
+    """
+    Flags de parede (N, S, E, O) à volta de (px, py), lidas do grid com borda
+
+    Coordenadas fora do grid com borda são encostadas à borda (parede),
+    pelo que agentes fora dos limites não precisam de um caminho à parte.
+    """
+    max_x = paredes_borda.shape[0] - 1
+    max_y = paredes_borda.shape[1] - 1
+    x_centro = min(max(px + 1, 0), max_x)
+    y_centro = min(max(py + 1, 0), max_y)
+    return (bool(paredes_borda[x_centro, min(max(py, 0), max_y)]),
+            bool(paredes_borda[x_centro, min(max(py + 2, 0), max_y)]),
+            bool(paredes_borda[min(max(px + 2, 0), max_x), y_centro]),
+            bool(paredes_borda[min(max(px, 0), max_x), y_centro]))
+
+
+@njit(cache=True)
+def _escavar_labirinto(caminhos, x0, y0, passo, deslocamentos, aleatorios):
+    """
+    Backtracking recursivo (com pilha explícita) a partir de (x0, y0)
+
+    Marca em caminhos (bool [x, y]) as células escavadas, saltando passo
+    células de cada vez e abrindo as intermédias. A escolha entre vizinhas
+    não visitadas consome, por ordem, um valor de aleatorios em [0, 1).
+    """
+    largura = caminhos.shape[0]
+    altura = caminhos.shape[1]
+    visitadas = np.zeros((largura, altura), dtype=np.bool_)
+    pilha = np.empty((largura * altura, 2), dtype=np.int32)
+    candidatas = np.empty(4, dtype=np.int64)
+    topo = 0
+    sorteio = 0
+
+    x, y = x0, y0
+    visitadas[x, y] = True
+    caminhos[x, y] = True
+    while True:
+        # Vizinhas (a passo células) dentro dos limites e não visitadas
+        num_candidatas = 0
+        for d in range(4):
+            vx = x + passo * deslocamentos[d, 0]
+            vy = y + passo * deslocamentos[d, 1]
+            if 0 <= vx < largura and 0 <= vy < altura and not visitadas[vx, vy]:
+                candidatas[num_candidatas] = d
+                num_candidatas += 1
+
+        if num_candidatas > 0:
+            d = candidatas[int(aleatorios[sorteio] * num_candidatas)]
+            sorteio += 1
+            dx = deslocamentos[d, 0]
+            dy = deslocamentos[d, 1]
+            # Abrir as células intermédias e a própria vizinha
+            for i in range(1, passo + 1):
+                caminhos[x + i * dx, y + i * dy] = True
+            pilha[topo, 0] = x
+            pilha[topo, 1] = y
+            topo += 1
+            x += passo * dx
+            y += passo * dy
+            visitadas[x, y] = True
+        elif topo > 0:
+            # Backtrack
+            topo -= 1
+            x = pilha[topo, 0]
+            y = pilha[topo, 1]
+        else:
+            break
+
+
+@njit(cache=True)
+def _campo_distancias(paredes_borda, fx, fy, deslocamentos):
+    """
+    Distância em passos (BFS) de cada célula até (fx, fy), contornando paredes
+
+    paredes_borda é o grid de paredes com borda, indexado por [x + 1, y + 1];
+    devolve um array int32 [x, y] com -1 nas células inalcançáveis.
+    """
+    largura = paredes_borda.shape[0] - 2
+    altura = paredes_borda.shape[1] - 2
+    distancias = np.full((largura, altura), -1, dtype=np.int32)
+    if paredes_borda[fx + 1, fy + 1]:
+        return distancias
+    fila = np.empty((largura * altura, 2), dtype=np.int32)
+    fila[0, 0] = fx
+    fila[0, 1] = fy
+    distancias[fx, fy] = 0
+    inicio = 0
+    fim = 1
+    while inicio < fim:
+        x = fila[inicio, 0]
+        y = fila[inicio, 1]
+        inicio += 1
+        for d in range(4):
+            vx = x + deslocamentos[d, 0]
+            vy = y + deslocamentos[d, 1]
+            # A borda é parede, pelo que a BFS nunca sai do grid
+            if not paredes_borda[vx + 1, vy + 1] and distancias[vx, vy] < 0:
+                distancias[vx, vy] = distancias[x, y] + 1
+                fila[fim, 0] = vx
+                fila[fim, 1] = vy
+                fim += 1
+    return distancias
 
 
 class AmbienteLabirinto(Ambiente):
     """Ambiente de labirinto com paredes"""
     
+    # Deslocamento (dx, dy) de cada direção, sem passar por Direcao.value
+    _DESLOCAMENTOS = {direcao: direcao.value for direcao in Direcao}
+    
+    # Nomes das direções vizinhas, pela ordem de _paredes_vizinhas
+    _NOMES_VIZINHOS = (Direcao.NORTE.name, Direcao.SUL.name, Direcao.ESTE.name, Direcao.OESTE.name)
+    
+    # Recompensas de movimento indexadas pelo sinal da aproximação ao fim + 1:
+    # (afastou-se, mesma distância, aproximou-se)
+    _RECOMPENSAS_APROXIMACAO = (-1.0, -0.1, 2.0)
+    
     def __init__(self, largura: int = 10, altura: int = 10,
                  densidade_paredes: float = 0.3,
                  pos_inicio: Posicao = None,
-                 pos_fim: Posicao = None):
+                 pos_fim: Posicao = None, seed: Optional[int] = None,
+                 regenerar_paredes: bool = True):
         super().__init__(largura, altura)
         
         self.densidade_paredes = densidade_paredes
+        # Se False, o labirinto gerado na construção mantém-se em todos os episódios
+        self.regenerar_paredes = regenerar_paredes
         
         # Posições de início e fim
         if pos_inicio:
@@ -32,137 +157,140 @@ class AmbienteLabirinto(Ambiente):
             # Canto inferior direito
             self.pos_fim = Posicao(largura - 1, altura - 1)
         
-        # Paredes
-        self.paredes: Set[Posicao] = set()
-        self._gerar_paredes()
+        # Gerador aleatório persistente (sorteios em lote); seed torna a
+        # geração dos labirintos reprodutível
+        self.rng = np.random.default_rng(seed)
         
-        # Garantir que início e fim não são paredes e são acessíveis
-        self.paredes.discard(self.pos_inicio)
-        self.paredes.discard(self.pos_fim)
+        # Paredes: grid booleano com borda indexado por [x + 1, y + 1]; a
+        # borda (fora dos limites) é sempre parede. grid_paredes é a vista
+        # [x, y] do interior, pelo que ambos ficam sempre em sincronia
+        self._grid_paredes_borda = np.ones((largura + 2, altura + 2), dtype=bool)
+        self.grid_paredes = self._grid_paredes_borda[1:-1, 1:-1]
+        self._paredes: Optional[FrozenSet[Posicao]] = None  # ver paredes
+        self._gerar_labirinto()
+        
+        # Número de agentes registados (evita len(self.agentes) a cada passo)
+        self._num_agentes = 0
         
         # Métricas
+        self._reiniciar_metricas()
+    
+    def registar_agente(self, agente_id: str, posicao: Posicao):
+        """Regista um agente e atualiza a contagem de agentes"""
+        super().registar_agente(agente_id, posicao)
+        self._num_agentes = len(self.agentes)
+    
+    def _reiniciar_metricas(self):
+        """Reinicia os contadores de chegada do episódio"""
+        # Contador em atributo (sem acesso por chave ao contar chegadas);
+        # tempos_chegada é partilhado com self.metricas e os contadores das
+        # métricas são escritos uma vez por chegada em _registar_chegada
+        self._agentes_no_fim = 0
+        self._tempos_chegada: Dict[str, int] = {}
         self.metricas.update({
             'agentes_no_fim': 0,
-            'tempos_chegada': {},
+            'tempos_chegada': self._tempos_chegada,
             'caminhos_encontrados': 0
         })
     
+    def _gerar_labirinto(self):
+        """Gera as paredes e o campo de distâncias ao fim do episódio"""
+        self._gerar_paredes()
+        self._paredes = None
+        
+        # Garantir que início e fim não são paredes e são acessíveis
+        self._libertar_inicio_fim()
+        
+        # Distância (em passos, contornando paredes) de cada célula ao fim;
+        # fixa durante o episódio, pelo que a observação só a consulta
+        self.distancias_fim = self._campo_distancias_ate(self.pos_fim)
+        
+        # Garantir caminho do início ao fim (respondido pelo próprio campo)
+        if not self._verificar_caminho(self.pos_inicio, self.pos_fim):
+            # Se não há caminho, criar um caminho garantido
+            self._criar_caminho_garantido()
+            self.distancias_fim = self._campo_distancias_ate(self.pos_fim)
+    
+    def _campo_distancias_ate(self, alvo: Posicao) -> np.ndarray:
+        """Campo de distâncias BFS (int32 [x, y], -1 = inalcançável) até alvo"""
+        if not self.posicao_valida(alvo):
+            return np.full((self.largura, self.altura), -1, dtype=np.int32)
+        return _campo_distancias(self._grid_paredes_borda, alvo.x, alvo.y,
+                                 _DESLOCAMENTOS_VIZINHOS)
+    
     def _gerar_paredes(self):
         """Gera um labirinto tradicional usando algoritmo de backtracking"""
         # Inicializar: começar com todas as células como paredes
-        self.paredes.clear()
-        caminhos = set()  # Células que são caminhos (não paredes)
+        caminhos = np.zeros((self.largura, self.altura), dtype=bool)  # True = caminho
         
         # Garantir que início e fim são caminhos
-        caminhos.add(self.pos_inicio)
-        caminhos.add(self.pos_fim)
-        
-        # Usar algoritmo de backtracking para criar labirinto
-        visitadas = set()
-        pilha = []
+        caminhos[self.pos_fim.x, self.pos_fim.y] = True
         
-        # Começar do início
-        celula_atual = self.pos_inicio
-        visitadas.add(celula_atual)
-        caminhos.add(celula_atual)
-        
-        # Direções possíveis
-        direcoes = [Direcao.NORTE, Direcao.SUL, Direcao.ESTE, Direcao.OESTE]
-        
-        # Criar labirinto usando backtracking
+        # Criar labirinto usando backtracking (núcleo compilado com Numba, se disponível)
         # Para labirintos pequenos, usar passo de 1; para maiores, passo de 2
         passo = 2 if min(self.largura, self.altura) > 6 else 1
         
-        while True:
-            # Encontrar células vizinhas não visitadas
-            vizinhas_nao_visitadas = []
-            for direcao in direcoes:
-                # Mover N células na direção
-                dx, dy = direcao.value
-                vizinha = Posicao(celula_atual.x + passo*dx, celula_atual.y + passo*dy)
-                
-                if (self.posicao_valida(vizinha) and 
-                    vizinha not in visitadas):
-                    vizinhas_nao_visitadas.append((vizinha, direcao))
-            
-            if vizinhas_nao_visitadas:
-                # Escolher uma direção aleatória
-                vizinha, direcao = random.choice(vizinhas_nao_visitadas)
-                
-                # Adicionar células intermediárias como caminhos
-                dx, dy = direcao.value
-                for i in range(1, passo + 1):
-                    celula_intermedia = Posicao(celula_atual.x + i*dx, celula_atual.y + i*dy)
-                    if self.posicao_valida(celula_intermedia):
-                        caminhos.add(celula_intermedia)
-                
-                # Marcar como visitada e adicionar aos caminhos
-                visitadas.add(vizinha)
-                caminhos.add(vizinha)
-                
-                # Adicionar à pilha e continuar
-                pilha.append(celula_atual)
-                celula_atual = vizinha
-            elif pilha:
-                # Backtrack
-                celula_atual = pilha.pop()
-            else:
-                break
+        # Um sorteio por célula escavada: no máximo uma por célula da malha de passo
+        x0, y0 = self.pos_inicio.x, self.pos_inicio.y
+        num_celulas = (len(range(x0 % passo, self.largura, passo)) *
+                       len(range(y0 % passo, self.altura, passo)))
+        _escavar_labirinto(caminhos, x0, y0, passo, _DESLOCAMENTOS_VIZINHOS,
+                           self.rng.random(num_celulas))
         
         # Adicionar algumas células aleatórias como caminhos para tornar mais interessante
         # Mas garantir que não bloqueie o caminho principal
-        num_caminhos_extras = max(0, int(self.largura * self.altura * 0.15) - len(caminhos))
-        tentativas = 0
-        caminhos_adicionados = 0
-        
-        while caminhos_adicionados < num_caminhos_extras and tentativas < 2000:
-            x = random.randint(0, self.largura - 1)
-            y = random.randint(0, self.altura - 1)
-            pos = Posicao(x, y)
-            if pos not in caminhos and pos != self.pos_inicio and pos != self.pos_fim:
-                caminhos.add(pos)
-                caminhos_adicionados += 1
-            tentativas += 1
+        num_caminhos_extras = max(0, int(self.largura * self.altura * 0.15) - int(caminhos.sum()))
+        if num_caminhos_extras > 0:
+            # Até 2000 tentativas sorteadas de uma vez; ficam as primeiras
+            # num_caminhos_extras células distintas que ainda não são caminho
+            # (início e fim já são caminhos)
+            tentativas = (self.rng.integers(0, self.largura, size=2000) * self.altura +
+                          self.rng.integers(0, self.altura, size=2000))
+            livres = tentativas[~caminhos.ravel()[tentativas]]
+            _, primeiras = np.unique(livres, return_index=True)
+            novas = livres[np.sort(primeiras)[:num_caminhos_extras]]
+            caminhos.ravel()[novas] = True
         
         # Todas as células que não são caminhos são paredes
-        for x in range(self.largura):
-            for y in range(self.altura):
-                pos = Posicao(x, y)
-                if pos not in caminhos:
-                    self.paredes.add(pos)
-        
-        # Garantir caminho do início ao fim
-        if not self._verificar_caminho(self.pos_inicio, self.pos_fim):
-            # Se não há caminho, criar um caminho garantido
-            self._criar_caminho_garantido()
+        np.logical_not(caminhos, out=self.grid_paredes)
     
     def _verificar_caminho(self, inicio: Posicao, fim: Posicao) -> bool:
         """Verifica se existe caminho do início ao fim usando BFS"""
         if inicio == fim:
             return True
         
-        fila = [inicio]
-        visitadas = {inicio}
-        direcoes = [Direcao.NORTE, Direcao.SUL, Direcao.ESTE, Direcao.OESTE]
-        
-        while fila:
-            atual = fila.pop(0)
-            
-            for direcao in direcoes:
-                dx, dy = direcao.value
-                proxima = Posicao(atual.x + dx, atual.y + dy)
-                
-                if proxima == fim:
-                    return True
-                
-                if (self.posicao_valida(proxima) and 
-                    proxima not in visitadas and
-                    proxima not in self.paredes):
-                    visitadas.add(proxima)
-                    fila.append(proxima)
-        
-        return False
+        # Campo de distâncias BFS até ao fim (o do episódio, se fim for pos_fim)
+        if fim == self.pos_fim:
+            distancias = self.distancias_fim
+        else:
+            distancias = self._campo_distancias_ate(fim)
+        return self.posicao_valida(inicio) and bool(distancias[inicio.x, inicio.y] >= 0)
     
+    @property
+    def paredes(self) -> FrozenSet[Posicao]:
+        """Paredes como conjunto de posições (calculado uma vez por labirinto)"""
+        if self._paredes is None:
+            self._paredes = frozenset(Posicao(x, y)
+                                      for x, y in np.argwhere(self.grid_paredes).tolist())
+        return self._paredes
+
+    def _e_parede(self, x: int, y: int) -> bool:
+        """True se (x, y) for parede ou estiver fora dos limites"""
+        # Coordenadas fora do grid com borda são encostadas à borda (parede)
+        bx = min(max(x + 1, 0), self.largura + 1)
+        by = min(max(y + 1, 0), self.altura + 1)
+        return bool(self._grid_paredes_borda[bx, by])
+
+    def _libertar(self, pos: Posicao):
+        """Remove a parede em pos (se pos estiver dentro dos limites)"""
+        if self.posicao_valida(pos):
+            self.grid_paredes[pos.x, pos.y] = False
+
+    def _libertar_inicio_fim(self):
+        """Garante que início e fim não são paredes"""
+        self._libertar(self.pos_inicio)
+        self._libertar(self.pos_fim)
+
     def _criar_caminho_garantido(self):
         """Cria um caminho garantido do início ao fim"""
         # Criar caminho usando algoritmo simples
@@ -170,27 +298,27 @@ class AmbienteLabirinto(Ambiente):
         
         # Caminho em L: primeiro horizontal, depois vertical
         # Ou primeiro vertical, depois horizontal
-        if random.random() < 0.5:
+        if self.rng.random() < 0.5:
             # Primeiro horizontal, depois vertical
             while atual.x < self.pos_fim.x:
-                self.paredes.discard(atual)
+                self._libertar(atual)
                 atual = Posicao(atual.x + 1, atual.y)
             
             while atual.y < self.pos_fim.y:
-                self.paredes.discard(atual)
+                self._libertar(atual)
                 atual = Posicao(atual.x, atual.y + 1)
         else:
             # Primeiro vertical, depois horizontal
             while atual.y < self.pos_fim.y:
-                self.paredes.discard(atual)
+                self._libertar(atual)
                 atual = Posicao(atual.x, atual.y + 1)
             
             while atual.x < self.pos_fim.x:
-                self.paredes.discard(atual)
+                self._libertar(atual)
                 atual = Posicao(atual.x + 1, atual.y)
         
         # Garantir que fim está acessível
-        self.paredes.discard(self.pos_fim)
+        self._libertar(self.pos_fim)
     
     def observacao_para(self, agente_id: str) -> Observacao:
         """Retorna observação para o agente"""
@@ -199,20 +327,21 @@ class AmbienteLabirinto(Ambiente):
             return Observacao({}, agente_id)
         
         # Direção para o fim
-        dx = self.pos_fim.x - pos_agente.x
-        dy = self.pos_fim.y - pos_agente.y
-        
-        # Distância ao fim
-        distancia_fim = pos_agente.distancia(self.pos_fim)
+        px, py = pos_agente.x, pos_agente.y
+        dx = self.pos_fim.x - px
+        dy = self.pos_fim.y - py
+        
+        # Distância ao fim (Manhattan) e pelo caminho (campo pré-calculado; -1 se inalcançável)
+        distancia_fim = abs(dx) + abs(dy)
+        # Limites verificados em linha, sem chamar posicao_valida
+        if 0 <= px < self.largura and 0 <= py < self.altura:
+            distancia_caminho_fim = self.distancias_fim.item(px, py)
+        else:
+            distancia_caminho_fim = -1
         
-        # Detectar paredes/obstáculos nas direções adjacentes
-        obstaculos_vizinhos = {}
-        for direcao in [Direcao.NORTE, Direcao.SUL, Direcao.ESTE, Direcao.OESTE]:
-            pos_vizinha = pos_agente.mover(direcao)
-            obstaculos_vizinhos[direcao.name] = (
-                not self.posicao_valida(pos_vizinha) or
-                pos_vizinha in self.paredes
-            )
+        # Detectar paredes/obstáculos nas direções adjacentes (quatro leituras do grid com borda)
+        obstaculos_vizinhos = dict(zip(self._NOMES_VIZINHOS,
+                                       _paredes_vizinhas(self._grid_paredes_borda, px, py)))
         
         # Verificar se chegou ao fim
         no_fim = pos_agente == self.pos_fim
@@ -221,6 +350,7 @@ class AmbienteLabirinto(Ambiente):
             'posicao_atual': (pos_agente.x, pos_agente.y),
             'direcao_fim': (dx, dy),
             'distancia_fim': distancia_fim,
+            'distancia_caminho_fim': distancia_caminho_fim,
             'obstaculos_vizinhos': obstaculos_vizinhos,
             'no_fim': no_fim,
             'pos_inicio': (self.pos_inicio.x, self.pos_inicio.y),
@@ -239,31 +369,34 @@ class AmbienteLabirinto(Ambiente):
         recompensa = 0.0
         
         # Verificar se agente já chegou ao objetivo
-        ja_chegou = agente_id in self.metricas['tempos_chegada']
+        ja_chegou = agente_id in self._tempos_chegada
         
         if accao.tipo == "mover":
-            direcao = accao.parametros.get('direcao', Direcao.PARADO)
-            nova_pos = pos_atual.mover(direcao)
+            # Coordenadas inteiras; a Posicao (partilhada) só é obtida ao guardar
+            dx, dy = self._DESLOCAMENTOS[accao.direcao]
+            x, y = pos_atual.x, pos_atual.y
+            nx, ny = x + dx, y + dy
+            fim_x, fim_y = self.pos_fim.x, self.pos_fim.y
             
             # Se já chegou, não dar recompensas por ficar parado ou se mover
             if ja_chegou:
                 # Se está no fim e tenta sair, pequena penalização
-                if pos_atual == self.pos_fim and nova_pos != self.pos_fim:
+                if x == fim_x and y == fim_y and (nx != fim_x or ny != fim_y):
                     recompensa = -0.1  # Pequena penalização por sair do objetivo
                 else:
                     # Se já chegou, recompensa zero (ou muito pequena negativa para desencorajar movimento)
-                    recompensa = -0.01 if nova_pos != pos_atual else 0.0
-                agente_info['posicao'] = nova_pos
+                    recompensa = -0.01 if (dx or dy) else 0.0
+                agente_info['posicao'] = Posicao.obter(nx, ny)
                 return recompensa
             
             # Verificar se movimento é válido
-            if (self.posicao_valida(nova_pos) and
-                    nova_pos not in self.paredes):
+            if not self._e_parede(nx, ny):
                 
-                # Calcular recompensa baseada na aproximação ao fim
-                dist_antiga = pos_atual.distancia(self.pos_fim)
-                dist_nova = nova_pos.distancia(self.pos_fim)
+                # Calcular recompensa baseada na aproximação ao fim (Manhattan, em linha)
+                dist_antiga = abs(x - fim_x) + abs(y - fim_y)
+                dist_nova = abs(nx - fim_x) + abs(ny - fim_y)
                 
+                nova_pos = Posicao.obter(nx, ny)
                 agente_info['posicao'] = nova_pos
                 agente_info['historico_posicoes'].append(nova_pos)
                 
@@ -275,50 +408,112 @@ class AmbienteLabirinto(Ambiente):
                     recompensa = -0.1  # Pequena penalização por não progredir
                 
                 # Recompensa por alcançar o fim (escalonada)
-                if nova_pos == self.pos_fim:
-                    # Contar quantos agentes já chegaram
-                    num_ja_chegaram = self.metricas['agentes_no_fim']
-                    # Recompensa base reduzida e escalonada
-                    recompensa_base = 15.0
-                    # Bonus por chegar primeiro
-                    bonus_primeiro = 5.0 if num_ja_chegaram == 0 else 0.0
-                    # Penalização progressiva para quem chega depois
-                    penalizacao_ordem = num_ja_chegaram * 1.5
-                    recompensa = recompensa_base + bonus_primeiro - penalizacao_ordem
-                    
-                    if agente_id not in self.metricas['tempos_chegada']:
-                        self.metricas['tempos_chegada'][agente_id] = self.passo_atual
-                        self.metricas['agentes_no_fim'] += 1
-                        self.metricas['caminhos_encontrados'] += 1
+                if nx == fim_x and ny == fim_y:
+                    recompensa = self._registar_chegada(agente_id)
             else:
                 # Penalização por movimento inválido (parede)
                 recompensa = -0.5  # Penalização maior
         
         return recompensa
     
+    def _registar_chegada(self, agente_id: str) -> float:
+        """Regista a chegada de um agente ao fim e devolve a recompensa escalonada"""
+        # Contar quantos agentes já chegaram
+        num_ja_chegaram = self._agentes_no_fim
+        # Recompensa base reduzida e escalonada
+        recompensa_base = 15.0
+        # Bonus por chegar primeiro
+        bonus_primeiro = 5.0 if num_ja_chegaram == 0 else 0.0
+        # Penalização progressiva para quem chega depois
+        penalizacao_ordem = num_ja_chegaram * 1.5
+        
+        if agente_id not in self._tempos_chegada:
+            self._tempos_chegada[agente_id] = self.passo_atual
+            self._agentes_no_fim = num_ja_chegaram + 1
+            self.metricas['agentes_no_fim'] = self._agentes_no_fim
+            # Cada chegada conta como um caminho encontrado
+            self.metricas['caminhos_encontrados'] = self._agentes_no_fim
+        
+        return recompensa_base + bonus_primeiro - penalizacao_ordem
+    
+    def agir_lote(self, deslocamentos: np.ndarray, agente_ids: List[str] = None) -> np.ndarray:
+        """
+        Executa um movimento de vários agentes numa só chamada vetorizada
+
+        Equivalente a chamar agir() com ações "mover" para cada agente, pela
+        ordem de agente_ids (a ordem só importa no escalonamento da
+        recompensa de chegada ao fim).
+
+        Args:
+            deslocamentos: Array (N, 2) com o (dx, dy) de cada agente
+            agente_ids: IDs distintos dos agentes (por omissão, todos pela ordem de registo)
+
+        Returns:
+            Array (N,) com as recompensas
+        """
+        if agente_ids is None:
+            agente_ids = list(self.agentes)
+        deslocamentos = np.asarray(deslocamentos, dtype=np.int32).reshape(-1, 2)
+        infos = [self.agentes[a] for a in agente_ids]
+        tempos_chegada = self._tempos_chegada
+        fim_x, fim_y = self.pos_fim.x, self.pos_fim.y
+
+        ax = np.fromiter((info['posicao'].x for info in infos), dtype=np.int32, count=len(infos))
+        ay = np.fromiter((info['posicao'].y for info in infos), dtype=np.int32, count=len(infos))
+        dx, dy = deslocamentos[:, 0], deslocamentos[:, 1]
+        nx, ny = ax + dx, ay + dy
+        ja_chegou = np.fromiter((a in tempos_chegada for a in agente_ids),
+                                dtype=bool, count=len(infos))
+
+        # Agentes que já chegaram: movem-se livremente, com penalização por sair do fim
+        no_fim = (ax == fim_x) & (ay == fim_y)
+        sai_do_fim = no_fim & ((nx != fim_x) | (ny != fim_y))
+        recompensas_chegou = np.where(sai_do_fim, -0.1,
+                                      np.where((dx != 0) | (dy != 0), -0.01, 0.0))
+
+        # Restantes: validade via grid com borda (fora dos limites = parede) e
+        # recompensa pelo sinal da aproximação ao fim
+        bx = np.clip(nx + 1, 0, self.largura + 1)
+        by = np.clip(ny + 1, 0, self.altura + 1)
+        valido = ~self._grid_paredes_borda[bx, by]
+        aproximacao = (np.abs(ax - fim_x) + np.abs(ay - fim_y) -
+                       np.abs(nx - fim_x) - np.abs(ny - fim_y))
+        recompensas = np.take(self._RECOMPENSAS_APROXIMACAO, np.sign(aproximacao) + 1)
+        recompensas = np.where(valido, recompensas, -0.5)  # Penalização por parede
+        recompensas = np.where(ja_chegou, recompensas_chegou, recompensas)
+
+        move = ja_chegou | valido
+        for i in np.flatnonzero(move).tolist():
+            nova_pos = Posicao.obter(int(nx[i]), int(ny[i]))
+            infos[i]['posicao'] = nova_pos
+            if not ja_chegou[i]:
+                infos[i]['historico_posicoes'].append(nova_pos)
+
+        # Chegadas processadas pela ordem dos agentes (recompensa escalonada)
+        chegam = ~ja_chegou & valido & (nx == fim_x) & (ny == fim_y)
+        for i in np.flatnonzero(chegam).tolist():
+            recompensas[i] = self._registar_chegada(agente_ids[i])
+
+        return recompensas
+    
     def atualizacao(self):
         """Atualiza o ambiente"""
         self.passo_atual += 1
         
         # Condição de terminação: todos os agentes no fim
-        if (len(self.agentes) > 0 and
-                self.metricas['agentes_no_fim'] == len(self.agentes)):
+        num_agentes = self._num_agentes
+        if num_agentes and self._agentes_no_fim == num_agentes:
             self.terminar_episodio()
     
     def reset(self):
         """Reinicia o ambiente"""
         super().reset()
         
-        # Regenerar paredes
-        self.paredes.clear()
-        self._gerar_paredes()
-        self.paredes.discard(self.pos_inicio)
-        self.paredes.discard(self.pos_fim)
+        # Regenerar paredes (as paredes e o campo de distâncias não mudam
+        # durante um episódio, pelo que mantê-los não exige nenhuma cópia)
+        if self.regenerar_paredes:
+            self._gerar_labirinto()
         
         # Resetar métricas
-        self.metricas.update({
-            'agentes_no_fim': 0,
-            'tempos_chegada': {},
-            'caminhos_encontrados': 0
-        })
+        self._reiniciar_metricas()
 
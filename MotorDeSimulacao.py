@@ -2,17 +2,36 @@
 Módulo do Motor de Simulação - Gerencia o ciclo de execução dos agentes
 """
 
+import asyncio
+import contextlib
+import io
 import json
+import logging
+import multiprocessing as mp
+import os
+import queue
+import random
+import threading
 import time
+from collections import deque
 from datetime import datetime
-from typing import List, Dict, Any, Optional
+from types import MappingProxyType
+from typing import List, Dict, Any, Optional, Mapping
 
-import self
+import numpy as np
 
 from agente import Agente, FabricaAgentes
-from ambiente import Ambiente, FabricaAmbientes, TipoAmbiente
+from ambiente import Acao, Ambiente, Posicao, TipoAmbiente
 from FabricaAmbientes import FabricaAmbientes
-from typing import Optional
+
+# Progresso passo a passo (nível INFO): cada motor só o emite com 'verbose'
+log = logging.getLogger(__name__)
+if not log.handlers:
+    _handler = logging.StreamHandler()
+    _handler.setFormatter(logging.Formatter("%(message)s"))
+    log.addHandler(_handler)
+    log.propagate = False
+    log.setLevel(logging.INFO)
 
 
 class MotorDeSimulacao:
@@ -40,12 +59,28 @@ class MotorDeSimulacao:
         self.passo_atual = 0
         self.passos_totais = self.parametros.get('passos_totais', 1000)
         self.delay_entre_passos = self.parametros.get('delay_entre_passos', 0.1)
+        # Pausa agrupada: dorme uma vez a cada N passos (a visualização continua a cada passo)
+        self.passos_por_pausa = max(1, int(self.parametros.get('passos_por_pausa', 1)))
         self.num_episodios = self.parametros.get('num_episodios', 1)
         self.episodio_atual = 0
         
         # Modo de operação (aprendizagem ou teste)
         self.modo_operacao = self.parametros.get('modo_operacao', 'teste').lower()
 
+        # Mensagens de progresso por passo (verificado em cada mensagem; o
+        # logger do módulo é partilhado por todas as instâncias)
+        self.verbose = self.parametros.get('verbose', False)
+
+        # Passo em lote: movimentos de todos os agentes numa só chamada a agir_lote.
+        # Desligado por omissão: só compensa com muitos agentes (ver benchmark_passo.py)
+        self.passo_em_lote = self.parametros.get('passo_em_lote', False)
+        # Buffers por agente (Struct-of-Arrays), dimensionados em _configurar_agentes
+        self._deslocamentos = np.zeros((0, 2), dtype=np.int32)
+        self._recompensas = np.zeros(0, dtype=np.float64)
+        # Decisões dos agentes em paralelo (asyncio); ciclo de eventos criado a pedido
+        self.passo_paralelo = self.parametros.get('passo_paralelo', False)
+        self._ciclo_eventos: Optional[asyncio.AbstractEventLoop] = None
+
         # Métricas
         self.metricas = {
             'inicio_execucao': None,
@@ -54,13 +89,27 @@ class MotorDeSimulacao:
             'passos_executados': 0,
             'recompensa_total': 0
         }
+        # Vista só de leitura devolvida por obter_metricas (sem cópia por chamada)
+        self._metricas_vista = MappingProxyType(self.metricas)
         
         # Métricas por episódio
         self.historico_episodios = []
+        # Agregados mantidos à medida que os episódios terminam (ver _registar_episodio)
+        self._recompensas_episodios = np.zeros(max(1, self.num_episodios), dtype=np.float64)
+        self._janela_recompensas = deque(maxlen=10)  # Últimos 10 episódios
+        self._episodios_com_sucesso = 0
+        # True se os episódios correram noutros processos (agentes locais não executaram)
+        self._episodios_em_paralelo = False
         
         # Visualização
         self.visualizador = None
         self.usar_visualizacao = self.parametros.get('usar_visualizacao', False)
+        # Desenho numa thread própria: o passo não espera pelo limite de FPS
+        self.visualizacao_em_thread = self.parametros.get('visualizacao_em_thread', False)
+        self._thread_visualizacao: Optional[threading.Thread] = None
+        self._fila_visualizacao: Optional[queue.Queue] = None
+        # Exclusão entre o passo e o desenho (só é um Lock com a thread ativa)
+        self._trinco_passo = contextlib.nullcontext()
 
     @staticmethod
     def cria(nome_do_ficheiro_parametros: str) -> 'MotorDeSimulacao':
@@ -136,28 +185,101 @@ class MotorDeSimulacao:
 
             # Registrar agente no ambiente
             posicao_inicial = config.get('posicao_inicial', {'x': 0, 'y': 0})
-            from ambiente import Posicao
             pos = Posicao(posicao_inicial['x'], posicao_inicial['y'])
 
             self.ambiente.registar_agente(agente_id, pos)
             self.posicoes_iniciais[agente_id] = pos  # Armazenar posição inicial
 
+            # Histórico de ações com espaço para um episódio completo
+            agente.historico_acoes.redimensionar(self.passos_totais)
             self.agentes.append(agente)
 
             print(f"   ✅ Agente {agente_id} ({tipo}) registado em {pos}")
+
+        self._alocar_buffers()
+
+    def _alocar_buffers(self):
+        """(Re)dimensiona os buffers por agente usados no passo em lote"""
+        n = len(self.agentes)
+        if len(self._recompensas) != n:
+            self._deslocamentos = np.zeros((n, 2), dtype=np.int32)
+            self._recompensas = np.zeros(n, dtype=np.float64)
     
     def _inicializar_visualizacao(self):
         """Inicializa o visualizador"""
+        # Importado só aqui: execuções sem visualização não carregam o Pygame
         try:
             from visualizacao import Visualizador
-            self.visualizador = Visualizador(self.ambiente)
-            print("   ✅ Visualização inicializada")
         except ImportError:
             print("   ⚠️  Pygame não disponível. Visualização desativada.")
             self.usar_visualizacao = False
+            return
+
+        try:
+            self.visualizador = Visualizador(
+                self.ambiente, desenho_fora_do_ecra=self.visualizacao_em_thread)
+            print("   ✅ Visualização inicializada")
         except Exception as e:
             print(f"   ⚠️  Erro ao inicializar visualização: {e}")
             self.usar_visualizacao = False
+            return
+
+        if self.visualizacao_em_thread:
+            self._iniciar_thread_visualizacao()
+
+    def _iniciar_thread_visualizacao(self):
+        """
+        Passa o desenho para uma thread, alimentada por uma fila de um só lugar
+
+        O passo publica o seu número sem bloquear; se a thread ainda estiver a
+        desenhar o anterior, o fotograma é descartado. A thread só desenha numa
+        superfície fora do ecrã: eventos e display.flip ficam na thread
+        principal (a que criou a janela), como o SDL exige. Desenhar (que lê o
+        ambiente e os agentes) e executar um passo excluem-se mutuamente.
+        """
+        self._trinco_passo = threading.Lock()
+        self._fila_visualizacao = queue.Queue(maxsize=1)
+        self._thread_visualizacao = threading.Thread(
+            target=self._ciclo_visualizacao, name="visualizacao", daemon=True)
+        self._thread_visualizacao.start()
+
+    def _ciclo_visualizacao(self):
+        """Ciclo da thread de visualização (termina com None na fila)"""
+        while True:
+            passo = self._fila_visualizacao.get()
+            if passo is None:
+                return
+            with self._trinco_passo:
+                self.visualizador.desenhar(passo, self.agentes)
+            self.visualizador.concluir_desenho()
+
+    def _publicar_passo_visualizacao(self):
+        """Entrega o passo atual à thread de visualização, descartando-o se estiver ocupada"""
+        try:
+            self._fila_visualizacao.put_nowait(self.passo_atual)
+        except queue.Full:
+            pass
+
+    def _fechar_visualizacao(self):
+        """Termina a thread de visualização (se existir) e fecha o visualizador"""
+        thread = self._thread_visualizacao
+        if thread is not None:
+            fila = self._fila_visualizacao
+            while thread.is_alive():
+                # Substitui um fotograma pendente pelo sinal de fim
+                try:
+                    fila.put(None, timeout=0.1)
+                    break
+                except queue.Full:
+                    try:
+                        fila.get_nowait()
+                    except queue.Empty:
+                        pass
+            thread.join()
+            self._thread_visualizacao = None
+            self._fila_visualizacao = None
+            self._trinco_passo = contextlib.nullcontext()
+        self.visualizador.fechar()
 
     def listaAgentes(self) -> List[Agente]:
         """
@@ -189,150 +311,255 @@ class MotorDeSimulacao:
     
     def _executar_multi_episodio(self):
         """Executa múltiplos episódios de treino"""
-        inicio_tempo_total = time.time()
-        
-        for episodio in range(1, self.num_episodios + 1):
-            self.episodio_atual = episodio
-            
-            # Reset para novo episódio
-            self._reset_episodio()
-            
-            # Executar episódio
-            print(f"\n{'─'*60}")
-            print(f"📖 Episódio {episodio}/{self.num_episodios}")
-            print(f"{'─'*60}")
-            
-            inicio_episodio = time.time()
-            recompensa_episodio = 0
-            
-            # Ciclo do episódio
-            while (self.passo_atual < self.passos_totais and
-                   not self.ambiente.terminado and
-                   self.em_execucao):
-                self._executar_passo()
-                if self.delay_entre_passos > 0 and episodio == self.num_episodios:
-                    time.sleep(self.delay_entre_passos)
-            
-            # Finalizar episódio
-            fim_episodio = time.time()
-            tempo_episodio = fim_episodio - inicio_episodio
-            recompensa_episodio = self.metricas['recompensa_total']
-            
-            # Notificar agentes do fim do episódio
-            for agente in self.agentes:
-                if hasattr(agente, 'fim_episodio'):
-                    agente.fim_episodio()
-            
-            # Guardar métricas do episódio
-            self.historico_episodios.append({
-                'episodio': episodio,
-                'passos': self.passo_atual,
-                'recompensa_total': recompensa_episodio,
-                'tempo': tempo_episodio,
-                'agentes_no_farol': self.ambiente.metricas.get('agentes_no_farol', 0)
-            })
-            
-            # Mostrar progresso
-            if episodio % 10 == 0 or episodio == self.num_episodios:
-                media_reward = sum(e['recompensa_total'] for e in self.historico_episodios[-10:]) / min(10, len(self.historico_episodios))
-                print(f"  ✅ Recompensa: {recompensa_episodio:.1f} | Média (últimos 10): {media_reward:.1f}")
-                
-                # Mostrar epsilon se disponível
-                for agente in self.agentes:
-                    if hasattr(agente, 'epsilon'):
-                        print(f"     {agente.agente_id}: epsilon={agente.epsilon:.3f}, Q-table={len(getattr(agente, 'Q', {}))}")
-        
+        inicio_tempo_total = time.perf_counter()
+
+        if self._episodios_independentes():
+            self._executar_episodios_paralelo()
+        else:
+            for episodio in range(1, self.num_episodios + 1):
+                # Executar episódio
+                print(f"\n{'─'*60}")
+                print(f"📖 Episódio {episodio}/{self.num_episodios}")
+                print(f"{'─'*60}")
+
+                self._registar_episodio(self._executar_episodio(episodio))
+                self._mostrar_progresso(episodio)
+
         # Finalização
-        self.metricas['tempo_execucao'] = time.time() - inicio_tempo_total
+        self.metricas['tempo_execucao'] = time.perf_counter() - inicio_tempo_total
         
+        self._fechar_ciclo_eventos()
+
         # Fechar visualização
         if self.usar_visualizacao and self.visualizador:
-            self.visualizador.fechar()
+            self._fechar_visualizacao()
         
         self._mostrar_resultados_multi_episodio()
-    
+
+    def _executar_episodio(self, episodio: int) -> Dict[str, Any]:
+        """Executa um episódio completo e devolve as suas métricas"""
+        self.episodio_atual = episodio
+
+        # Reset para novo episódio
+        self._reset_episodio()
+
+        inicio_episodio = time.perf_counter()
+
+        # Ciclo do episódio (referências locais: fixas durante o episódio)
+        ambiente = self.ambiente
+        passos_totais = self.passos_totais
+        executar_passo = self._executar_passo
+        com_pausa = episodio == self.num_episodios and self.delay_entre_passos > 0
+        while (self.passo_atual < passos_totais and
+               not ambiente.terminado and
+               self.em_execucao):
+            executar_passo()
+            if com_pausa:
+                self._aguardar_delay()
+
+        # Finalizar episódio
+        tempo_episodio = time.perf_counter() - inicio_episodio
+
+        # Notificar agentes do fim do episódio
+        for agente in self.agentes:
+            if hasattr(agente, 'fim_episodio'):
+                agente.fim_episodio()
+
+        return {
+            'episodio': episodio,
+            'passos': self.passo_atual,
+            'recompensa_total': self.metricas['recompensa_total'],
+            'tempo': tempo_episodio,
+            'agentes_no_farol': self.ambiente.metricas.get('agentes_no_farol', 0)
+        }
+
+    def _registar_episodio(self, resultado: Dict[str, Any]):
+        """Guarda as métricas de um episódio e atualiza os agregados"""
+        n = len(self.historico_episodios)
+        self.historico_episodios.append(resultado)
+
+        if n == len(self._recompensas_episodios):
+            # Execuções repetidas (retomar) podem exceder num_episodios
+            self._recompensas_episodios = np.resize(self._recompensas_episodios, 2 * n)
+        recompensa = resultado['recompensa_total']
+        self._recompensas_episodios[n] = recompensa
+        self._janela_recompensas.append(recompensa)
+        if resultado['agentes_no_farol'] > 0:
+            self._episodios_com_sucesso += 1
+
+    def _media_recente(self) -> float:
+        """Recompensa média dos últimos 10 episódios"""
+        janela = self._janela_recompensas
+        return sum(janela) / len(janela)
+
+    def _mostrar_progresso(self, episodio: int):
+        """Mostra o progresso a cada 10 episódios e no último"""
+        if episodio % 10 == 0 or episodio == self.num_episodios:
+            recompensa_episodio = self._janela_recompensas[-1]
+            media_reward = self._media_recente()
+            print(f"  ✅ Recompensa: {recompensa_episodio:.1f} | Média (últimos 10): {media_reward:.1f}")
+
+            # Mostrar epsilon se disponível
+            for agente in self.agentes:
+                if hasattr(agente, 'epsilon'):
+                    print(f"     {agente.agente_id}: epsilon={agente.epsilon:.3f}, Q-table={len(getattr(agente, 'Q', {}))}")
+
+    def _episodios_independentes(self) -> bool:
+        """
+        Indica se os episódios podem correr em processos separados
+
+        Só em modo teste, sem visualização, com 'processos' > 1 e sem agentes
+        que transportem estado de um episódio para o seguinte (ver
+        _transporta_estado): essa aprendizagem perder-se-ia nos processos.
+        """
+        return (self.parametros.get('processos', 1) > 1 and
+                self.modo_operacao == 'teste' and
+                not self.usar_visualizacao and
+                not any(self._transporta_estado(agente) for agente in self.agentes))
+
+    @staticmethod
+    def _transporta_estado(agente: Agente) -> bool:
+        """Indica se o agente aprende ou evolui entre episódios (Q-Learning em treino, evolucionário)"""
+        from agentegenetico import AgenteEvolucionario
+        return (getattr(agente, 'modo_aprendizagem', False) or
+                isinstance(agente, AgenteEvolucionario))
+
+    def _executar_episodios_paralelo(self):
+        """
+        Distribui os episódios por um conjunto de processos
+
+        Cada processo constrói uma vez o seu próprio ambiente e agentes a partir
+        de self.parametros; só as métricas de cada episódio regressam ao
+        processo principal. Os agentes deste processo não são alterados.
+        """
+        processos = min(self.parametros['processos'], self.num_episodios, os.cpu_count() or 1)
+        print(f"⚙️  Episódios distribuídos por {processos} processos")
+        self._episodios_em_paralelo = True
+
+        resultados = []
+        with mp.Pool(processos, initializer=_iniciar_trabalhador,
+                     initargs=(self.parametros,)) as pool:
+            for resultado in pool.imap_unordered(_executar_um_episodio,
+                                                 range(1, self.num_episodios + 1)):
+                print(f"  📖 Episódio {resultado['episodio']}/{self.num_episodios} concluído")
+                resultados.append(resultado)
+
+        # Registados pela ordem dos episódios, como no caminho sequencial
+        resultados.sort(key=lambda e: e['episodio'])
+        for resultado in resultados:
+            self._registar_episodio(resultado)
+        ultimo = resultados[-1]
+        self.episodio_atual = ultimo['episodio']
+        self.passo_atual = ultimo['passos']
+        self.metricas['recompensa_total'] = ultimo['recompensa_total']
+        self._mostrar_progresso(self.num_episodios)
+
     def _executar_episodio_unico(self):
         """Executa um único episódio (comportamento original)"""
         self.em_execucao = True
         self.metricas['inicio_execucao'] = datetime.now()
-        inicio_tempo = time.time()
-
-        # Ciclo principal de simulação
-        while (self.passo_atual < self.passos_totais and
-               not self.ambiente.terminado and
+        inicio_tempo = time.perf_counter()
+
+        # Ciclo principal de simulação (referências locais: fixas durante o ciclo)
+        ambiente = self.ambiente
+        passos_totais = self.passos_totais
+        executar_passo = self._executar_passo
+        com_pausa = self.delay_entre_passos > 0
+        while (self.passo_atual < passos_totais and
+               not ambiente.terminado and
                self.em_execucao):
 
-            self._executar_passo()
+            executar_passo()
 
             # Pequena pausa para visualização (se configurado)
-            if self.delay_entre_passos > 0:
-                time.sleep(self.delay_entre_passos)
+            if com_pausa:
+                self._aguardar_delay()
 
         # Finalização
         self.em_execucao = False
-        fim_tempo = time.time()
+        fim_tempo = time.perf_counter()
         self.metricas['fim_execucao'] = datetime.now()
         self.metricas['tempo_execucao'] = fim_tempo - inicio_tempo
         
+        self._fechar_ciclo_eventos()
+
         # Fechar visualização
         if self.usar_visualizacao and self.visualizador:
-            self.visualizador.fechar()
+            self._fechar_visualizacao()
 
         self._mostrar_resultados()
     
+    def _aguardar_delay(self):
+        """Pausa entre passos, agrupada num só sleep a cada passos_por_pausa passos"""
+        if self.delay_entre_passos > 0 and self.passo_atual % self.passos_por_pausa == 0:
+            time.sleep(self.delay_entre_passos * self.passos_por_pausa)
+
     def _reset_episodio(self):
         """Reset do ambiente e agentes para novo episódio"""
         self.em_execucao = True
         self.passo_atual = 0
         self.metricas['recompensa_total'] = 0
         
-        # Reset ambiente
+        # Reset ambiente: os agentes continuam registados e o reset repõe,
+        # no próprio registo, a posição inicial, os recursos e o histórico
         self.ambiente.reset()
         
         # Reset agentes
         for agente in self.agentes:
             agente.reset()
-            # Re-registrar agente no ambiente com posição inicial
-            pos_inicial = self.posicoes_iniciais.get(agente.agente_id)
-            self.ambiente.registar_agente(agente.agente_id, pos_inicial)
-            agente.instala(self.ambiente, pos_inicial)
+            agente.instala(self.ambiente, self.posicoes_iniciais.get(agente.agente_id))
 
     def _executar_passo(self):
         """Executa um único passo de simulação"""
         self.passo_atual += 1
 
-        if self.passo_atual % 10 == 0:
-            print(f"⏱️  Passo {self.passo_atual}/{self.passos_totais}")
+        if self.verbose and self.passo_atual % 10 == 0:
+            log.info("⏱️  Passo %d/%d", self.passo_atual, self.passos_totais)
 
-        # Para cada agente na simulação
-        for agente in self.agentes:
-            if not self.em_execucao:
-                break
+        with self._trinco_passo:
+            if self.passo_em_lote or self.passo_paralelo:
+                recompensa_passo = self._processar_agentes_lote()
+            else:
+                # Para cada agente na simulação
+                recompensa_passo = 0.0
+                for agente in self.agentes:
+                    if not self.em_execucao:
+                        break
+
+                    recompensa_passo += self._processar_agente(agente)
 
-            self._processar_agente(agente)
+            # Recompensas do passo acumuladas numa só escrita
+            self.metricas['recompensa_total'] += recompensa_passo
 
-        # Atualizar ambiente
-        self.ambiente.atualizacao()
+            # Atualizar ambiente
+            self.ambiente.atualizacao()
         
         # Atualizar visualização
         if self.usar_visualizacao and self.visualizador:
-            continuar = self.visualizador.atualizar(self.passo_atual, self.agentes)
-            if not continuar:
-                self.em_execucao = False
+            if self._fila_visualizacao is not None:
+                # Eventos e apresentação aqui; o desenho corre na thread
+                if self.visualizador.processar_eventos():
+                    self._publicar_passo_visualizacao()
+                    self.visualizador.apresentar_pronta()
+                else:
+                    self.em_execucao = False
+            else:
+                continuar = self.visualizador.atualizar(self.passo_atual, self.agentes)
+                if not continuar:
+                    self.em_execucao = False
 
         # Atualizar métricas
         self.metricas['passos_executados'] = self.passo_atual
 
-    def _processar_agente(self, agente: Agente):
-        """Processa um agente individual num passo"""
+    def _processar_agente(self, agente: Agente) -> float:
+        """Processa um agente individual num passo e devolve a recompensa obtida"""
         agente_id = agente.agente_id
 
-        # 1. Obter observação do ambiente
-        obs = self.ambiente.observacao_para(agente_id)
+        # 1. A observação atual já foi entregue ao agente no fim do passo
+        # anterior (ou em instala); não é preciso voltar a pedi-la ao ambiente
 
         # 2. Agente decide ação (baseado na observação anterior)
         acao = agente.age()
-        acao.agente_id = agente_id
 
         # 3. Executar ação no ambiente
         recompensa = self.ambiente.agir(acao, agente_id)
@@ -342,10 +569,107 @@ class MotorDeSimulacao:
         agente.observacao(nova_obs, recompensa)
 
         # 5. Registar ação
-        agente.historico_acoes.append(acao)
+        agente.historico_acoes.append(acao, self.passo_atual)
+
+        return recompensa
 
-        # 6. Atualizar métricas
-        self.metricas['recompensa_total'] += recompensa
+    def _processar_agentes_lote(self) -> float:
+        """
+        Processa todos os agentes num passo, com os movimentos aplicados em lote
+
+        Cada agente decide com base na sua última observação, tal como no
+        caminho sequencial (com passo_paralelo, as decisões correm em
+        concorrência). Se todas as ações forem "mover", o ambiente
+        aplica-as numa só chamada vetorizada (agir_lote); caso contrário, as
+        ações já decididas são aplicadas uma a uma pela ordem dos agentes.
+        Mover não altera o estado observado pelos outros agentes, pelo que
+        observar depois de todos os movimentos equivale ao caminho sequencial.
+
+        Returns:
+            Soma das recompensas dos agentes neste passo
+        """
+        if not self.em_execucao:
+            return 0.0
+
+        agentes = self.agentes
+        ambiente = self.ambiente
+        self._alocar_buffers()
+
+        # 1-2. Todos os agentes decidem a ação
+        if self.passo_paralelo:
+            acoes = self._obter_ciclo_eventos().run_until_complete(self._decidir_acoes_async())
+        else:
+            acoes = self._decidir_acoes(agentes)
+        # As ações podem ser instâncias partilhadas (Acao.mover): não são alteradas
+        em_lote = (self.passo_em_lote and hasattr(ambiente, 'agir_lote') and
+                   all(acao.tipo == "mover" for acao in acoes))
+
+        # 3. Executar ações no ambiente
+        if not em_lote:
+            recompensa_passo = 0.0
+            for agente, acao in zip(agentes, acoes):
+                recompensa = ambiente.agir(acao, agente.agente_id)
+                self._concluir_acao(agente, acao, recompensa)
+                recompensa_passo += recompensa
+            return recompensa_passo
+
+        deslocamentos = self._deslocamentos
+        for i, acao in enumerate(acoes):
+            deslocamentos[i] = acao.direcao.value
+        recompensas = self._recompensas
+        recompensas[:] = ambiente.agir_lote(deslocamentos, [agente.agente_id for agente in agentes])
+
+        # 4-5. Observações e histórico
+        recompensas = recompensas.tolist()
+        for agente, acao, recompensa in zip(agentes, acoes, recompensas):
+            self._concluir_acao(agente, acao, recompensa)
+        return sum(recompensas)
+
+    @staticmethod
+    def _decidir_acoes(agentes: List[Agente]) -> List[Acao]:
+        """
+        Decide as ações de todos os agentes, pela ordem dos agentes
+
+        Se todos forem da mesma classe e esta tiver age_lote (ex.:
+        AgenteReativo), decidem numa só chamada; caso contrário, age() um a um.
+        """
+        tipo = type(agentes[0]) if agentes else None
+        age_lote = getattr(tipo, 'age_lote', None)
+        if age_lote is not None and all(type(agente) is tipo for agente in agentes):
+            return age_lote(agentes)
+        return [agente.age() for agente in agentes]
+
+    async def _decidir_acoes_async(self) -> List[Acao]:
+        """
+        Decide as ações de todos os agentes concorrentemente
+
+        Agentes com um método assíncrono aage() são aguardados diretamente; os
+        restantes correm age() no executor do ciclo de eventos. A ordem das
+        ações devolvidas é a dos agentes.
+        """
+        ciclo = asyncio.get_running_loop()
+        return await asyncio.gather(*[
+            agente.aage() if hasattr(agente, 'aage') else ciclo.run_in_executor(None, agente.age)
+            for agente in self.agentes
+        ])
+
+    def _obter_ciclo_eventos(self) -> asyncio.AbstractEventLoop:
+        """Ciclo de eventos reutilizado entre passos (ver passo_paralelo)"""
+        if self._ciclo_eventos is None or self._ciclo_eventos.is_closed():
+            self._ciclo_eventos = asyncio.new_event_loop()
+        return self._ciclo_eventos
+
+    def _fechar_ciclo_eventos(self):
+        """Fecha o ciclo de eventos do passo paralelo, se existir"""
+        if self._ciclo_eventos is not None:
+            self._ciclo_eventos.run_until_complete(self._ciclo_eventos.shutdown_default_executor())
+            self._ciclo_eventos.close()
+            self._ciclo_eventos = None
+
+    def _concluir_acao(self, agente: Agente, acao: Acao, recompensa: float):
+        """Entrega a nova observação e a recompensa ao agente e regista a ação"""
+        agente.observacao(self.ambiente.observacao_para(agente.agente_id), recompensa)
+        agente.historico_acoes.append(acao, self.passo_atual)
 
     def pausar(self):
         """Pausa a execução da simulação"""
@@ -410,19 +734,23 @@ class MotorDeSimulacao:
         print(f"  Tempo total: {self.metricas['tempo_execucao']:.2f} segundos")
         
         # Estatísticas de recompensa
-        recompensas = [e['recompensa_total'] for e in self.historico_episodios]
+        recompensas = self._recompensas_episodios[:len(self.historico_episodios)]
+        primeira, ultima = float(recompensas[0]), float(recompensas[-1])
         print(f"\n💰 EVOLUÇÃO DA RECOMPENSA:")
-        print(f"  Primeiro episódio: {recompensas[0]:.2f}")
-        print(f"  Último episódio: {recompensas[-1]:.2f}")
-        print(f"  Melhor episódio: {max(recompensas):.2f}")
-        print(f"  Média (últimos 10): {sum(recompensas[-10:])/min(10, len(recompensas)):.2f}")
-        melhoria = recompensas[-1] - recompensas[0]
-        percentual = (melhoria/abs(recompensas[0])*100) if recompensas[0] != 0 else 0
+        print(f"  Primeiro episódio: {primeira:.2f}")
+        print(f"  Último episódio: {ultima:.2f}")
+        print(f"  Melhor episódio: {recompensas.max():.2f}")
+        print(f"  Média (últimos 10): {self._media_recente():.2f}")
+        melhoria = ultima - primeira
+        percentual = (melhoria/abs(primeira)*100) if primeira != 0 else 0
         print(f"  Melhoria total: {melhoria:.2f} ({percentual:.1f}%)")
         
-        # Estatísticas dos agentes
+        # Estatísticas dos agentes (os deste processo não executaram em paralelo)
         print(f"\n👥 ESTADO FINAL DOS AGENTES:")
-        for agente in self.agentes:
+        if self._episodios_em_paralelo:
+            print("  (episódios executados em processos separados: "
+                  "estado por agente não disponível)")
+        for agente in (() if self._episodios_em_paralelo else self.agentes):
             stats = agente.obter_estatisticas()
             print(f"  {agente.agente_id}:")
             
@@ -435,15 +763,17 @@ class MotorDeSimulacao:
             print(f"    Espaços explorados: {stats['espacos_explorados']}")
 
         # Taxa de sucesso
-        sucessos = sum(1 for e in self.historico_episodios if e['agentes_no_farol'] > 0)
+        sucessos = self._episodios_com_sucesso
         taxa = sucessos/len(self.historico_episodios)*100 if self.historico_episodios else 0
         print(f"\n🎯 TAXA DE SUCESSO:")
         print(f"  Episódios com chegada ao farol: {sucessos}/{len(self.historico_episodios)} ({taxa:.1f}%)")
         
         print("\n" + "="*60)
 
-        # SALVAR MODELOS SE FOI TREINO MULTI-EPISÓDIO
-        if self.num_episodios > 1 and hasattr(self, 'ambiente'):
+        # SALVAR MODELOS SE FOI TREINO MULTI-EPISÓDIO (em paralelo, os agentes
+        # deste processo não executaram: não há modelo treinado a guardar)
+        if (self.num_episodios > 1 and hasattr(self, 'ambiente') and
+                not self._episodios_em_paralelo):
             # Extrair nome do ambiente
             nome_classe = self.ambiente.__class__.__name__
             if 'Farol' in nome_classe:
@@ -456,7 +786,6 @@ class MotorDeSimulacao:
                 nome_ambiente = 'desconhecido'
 
             # Salvar modelos dos agentes QLearning
-            import os
             pasta_modelos = "configs/modelos"
             if not os.path.exists(pasta_modelos):
                 os.makedirs(pasta_modelos, exist_ok=True)
@@ -471,14 +800,15 @@ class MotorDeSimulacao:
             # OFERECER VISUALIZAÇÃO APÓS RESULTADOS
         self._oferecer_visualizacao()
 
-    def obter_metricas(self) -> Dict[str, Any]:
+    def obter_metricas(self) -> Mapping[str, Any]:
         """
         Retorna métricas da simulação
 
         Returns:
-            Dicionário com métricas
+            Vista só de leitura das métricas (reflete alterações posteriores;
+            usar dict(...) para obter uma cópia fixa)
         """
-        return self.metricas.copy()
+        return self._metricas_vista
 
     def __str__(self):
         status = "Em execução" if self.em_execucao else "Parado"
@@ -522,6 +852,33 @@ class MotorDeSimulacao:
                     if continuar != 's':
                         break
 
+# Motor de cada processo trabalhador (ver _executar_episodios_paralelo)
+_motor_trabalhador: Optional[MotorDeSimulacao] = None
+
+
+def _iniciar_trabalhador(parametros: Dict[str, Any]):
+    """Constrói, uma vez por processo, o motor que executa os episódios"""
+    global _motor_trabalhador
+
+    # Sementes novas: processos criados por fork herdam o estado do pai
+    random.seed()
+    np.random.seed()
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        motor = MotorDeSimulacao(parametros)
+        motor._configurar_ambiente(parametros.get('ambiente', {}))
+        motor._configurar_agentes(parametros.get('agentes', []))
+    motor.usar_visualizacao = False
+    motor.delay_entre_passos = 0
+    _motor_trabalhador = motor
+
+
+def _executar_um_episodio(episodio: int) -> Dict[str, Any]:
+    """Executa um episódio no motor do processo trabalhador"""
+    with contextlib.redirect_stdout(io.StringIO()):
+        return _motor_trabalhador._executar_episodio(episodio)
+
+
     # Função de conveniência para compatibilidade
 def cria(nome_do_ficheiro_parametros: str) -> MotorDeSimulacao:
     """Alias para MotorDeSimulacao.cria()"""
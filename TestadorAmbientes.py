@@ -8,10 +8,83 @@ import time
 import numpy as np
 
 # Importar as classes do ambiente Farol
-from ambiente import (
-    AmbienteFarol, FabricaAmbientes, TipoAmbiente,
-    Posicao, Acao, Direcao, Observacao
-)
+from ambiente import TipoAmbiente, Posicao, Acao, Direcao, Observacao, njit
+from FabricaAmbientes import FabricaAmbientes
+
+# Códigos de direção usados por _escolher_direcao (índices neste tuplo)
+_DIRECOES_POR_CODIGO = (Direcao.NORTE, Direcao.SUL, Direcao.ESTE, Direcao.OESTE, Direcao.PARADO)
+_NORTE, _SUL, _ESTE, _OESTE, _PARADO = range(5)
+
+# Estratégias de escolha de direção
+_ESTRATEGIA_INTELIGENTE, _ESTRATEGIA_DIRETA, _ESTRATEGIA_CAUTELOSA = range(3)
+
+
+@njit(cache=True)
+def _escolher_direcao(dx, dy, obst_norte, obst_sul, obst_este, obst_oeste, estrategia):
+    """
+    Código da direção escolhida por uma estratégia, só com inteiros e booleanos
+
+    Args:
+        dx, dy: Vetor até ao farol
+        obst_*: Obstáculo na célula vizinha de cada direção
+        estrategia: _ESTRATEGIA_INTELIGENTE, _ESTRATEGIA_DIRETA ou _ESTRATEGIA_CAUTELOSA
+    """
+    livre = (not obst_norte, not obst_sul, not obst_este, not obst_oeste)
+    horizontal = _ESTE if dx > 0 else _OESTE
+    vertical = _SUL if dy > 0 else _NORTE
+
+    if estrategia == _ESTRATEGIA_CAUTELOSA:
+        # Direções por preferência, conforme o quadrante do farol
+        if dx > 0 and dy > 0:
+            preferencias = (_ESTE, _SUL, _NORTE, _OESTE)
+        elif dx > 0 and dy < 0:
+            preferencias = (_ESTE, _NORTE, _SUL, _OESTE)
+        elif dx < 0 and dy > 0:
+            preferencias = (_OESTE, _SUL, _NORTE, _ESTE)
+        else:
+            preferencias = (_OESTE, _NORTE, _SUL, _ESTE)
+        for direcao in preferencias:
+            if livre[direcao]:
+                return direcao
+        return _PARADO
+
+    # Direção principal: a da maior componente do vetor até ao farol
+    if abs(dx) > abs(dy):
+        principal, secundaria = horizontal, vertical
+    else:
+        principal, secundaria = vertical, horizontal
+    if livre[principal]:
+        return principal
+
+    if estrategia == _ESTRATEGIA_DIRETA:
+        # Só tenta as perpendiculares à principal
+        alternativa = _ESTE if principal == _NORTE or principal == _SUL else _NORTE
+        if livre[alternativa]:
+            return alternativa
+        if livre[alternativa + 1]:
+            return alternativa + 1
+        return _PARADO
+
+    # Inteligente: a secundária e depois qualquer direção livre
+    if livre[secundaria]:
+        return secundaria
+    for direcao in range(4):
+        if livre[direcao]:
+            return direcao
+    return _PARADO
+
+
+def _acao_estrategia(obs: Observacao, estrategia: int) -> Acao:
+    """Ação "mover" escolhida por _escolher_direcao para a observação"""
+    dx, dy = obs.dados['direcao_farol']
+    obstaculos = obs.dados['obstaculos_vizinhos']
+    codigo = _escolher_direcao(dx, dy, obstaculos['NORTE'], obstaculos['SUL'],
+                               obstaculos['ESTE'], obstaculos['OESTE'], estrategia)
+    return Acao.mover(_DIRECOES_POR_CODIGO[codigo])
+
+
+# Pausa entre passos no modo interativo (main); as simulações não pausam por omissão
+PAUSA_INTERATIVA = 0.5
 
 
 class TestadorFarol:
@@ -73,40 +146,56 @@ class TestadorFarol:
             dist = pos.distancia(self.ambiente.pos_farol)
             print(f"  {agente_id}: {pos} (distância: {dist:.1f})")
 
-    def executar_simulacao_basica(self, max_passos: int = 15):
-        """Executa uma simulação básica com movimentos direcionais"""
-        print(f"\n🎮 INICIANDO SIMULAÇÃO ({max_passos} passos máximos)")
-        print("=" * 50)
+    def executar_simulacao_basica(self, max_passos: int = 15, delay_s: float = 0.0,
+                                  verbose: bool = True):
+        """
+        Executa uma simulação básica com movimentos direcionais
+
+        Args:
+            max_passos: Número máximo de passos
+            delay_s: Pausa após cada passo, em segundos (0 = sem pausa)
+            verbose: Mostrar o detalhe de cada passo
+        """
+        if verbose:
+            print(f"\n🎮 INICIANDO SIMULAÇÃO ({max_passos} passos máximos)")
+            print("=" * 50)
+
+        # Os agentes não mudam durante a simulação: ids recolhidos uma só vez
+        agente_ids = tuple(self.ambiente.agentes)
 
         for passo in range(max_passos):
-            print(f"\n--- PASSO {passo} ---")
+            if verbose:
+                print(f"\n--- PASSO {passo} ---")
 
             if self.ambiente.terminado:
-                print("🎉 Simulação terminada antecipadamente!")
+                if verbose:
+                    print("🎉 Simulação terminada antecipadamente!")
                 break
 
             # Para cada agente no ambiente
-            for agente_id in list(self.ambiente.agentes.keys()):
-                self._processar_agente(agente_id, passo)
+            for agente_id in agente_ids:
+                self._processar_agente(agente_id, passo, verbose)
 
             # Atualizar ambiente
             self.ambiente.atualizacao()
 
-            # Pequena pausa para melhor visualização
-            time.sleep(0.5)
+            # Pausa opcional para melhor visualização
+            if delay_s:
+                time.sleep(delay_s)
 
         return self.ambiente.terminado
 
-    def _processar_agente(self, agente_id: str, passo: int):
+    def _processar_agente(self, agente_id: str, passo: int, verbose: bool = True):
         """Processa um agente individual num passo de simulação"""
         # 1. Obter observação
         obs = self.ambiente.observacao_para(agente_id)
-        pos_atual = self.ambiente.obter_posicao_agente(agente_id)
 
-        print(f"\n🔍 {agente_id} em {pos_atual}:")
-        print(f"   📡 Direção farol: {obs.dados['direcao_farol']}")
-        print(f"   📏 Distância: {obs.dados['distancia_farol']:.1f}")
-        print(f"   🚧 Obstáculos vizinhos: {obs.dados['obstaculos_vizinhos']}")
+        if verbose:
+            pos_atual = self.ambiente.obter_posicao_agente(agente_id)
+            print(f"\n🔍 {agente_id} em {pos_atual}:")
+            print(f"   📡 Direção farol: {obs.dados['direcao_farol']}")
+            print(f"   📏 Distância: {obs.dados['distancia_farol']:.1f}")
+            print(f"   🚧 Obstáculos vizinhos: {obs.dados['obstaculos_vizinhos']}")
 
         # 2. Escolher ação baseada na observação
         acao = self._escolher_acao_inteligente(obs, agente_id)
@@ -115,50 +204,37 @@ class TestadorFarol:
         recompensa = self.ambiente.agir(acao, agente_id)
 
         # 4. Mostrar resultados
-        nova_pos = self.ambiente.obter_posicao_agente(agente_id)
-        print(f"   🎯 Ação: {acao.tipo} {acao.parametros.get('direcao', 'PARADO').name}")
-        print(f"   📍 Nova posição: {nova_pos}")
-        print(f"   💰 Recompensa: {recompensa:.2f}")
+        if verbose:
+            nova_pos = self.ambiente.obter_posicao_agente(agente_id)
+            print(f"   🎯 Ação: {acao.tipo} {acao.parametros.get('direcao', 'PARADO').name}")
+            print(f"   📍 Nova posição: {nova_pos}")
+            print(f"   💰 Recompensa: {recompensa:.2f}")
 
-        # Verificar se chegou ao farol
-        if nova_pos == self.ambiente.pos_farol:
-            print(f"   🎉 {agente_id} CHEGOU AO FAROL!")
+            # Verificar se chegou ao farol
+            if nova_pos == self.ambiente.pos_farol:
+                print(f"   🎉 {agente_id} CHEGOU AO FAROL!")
 
     def _escolher_acao_inteligente(self, obs: Observacao, agente_id: str) -> Acao:
-        """Escolhe uma ação inteligente baseada na observação"""
-        dx, dy = obs.dados['direcao_farol']
-        obstaculos = obs.dados['obstaculos_vizinhos']
-
-        # Prioridade 1: Mover na direção principal do farol
-        direcoes_prioritarias = []
-
-        if abs(dx) > abs(dy):
-            # Farol está mais na horizontal
-            direcoes_prioritarias.append(Direcao.ESTE if dx > 0 else Direcao.OESTE)
-            direcoes_prioritarias.append(Direcao.SUL if dy > 0 else Direcao.NORTE)
-        else:
-            # Farol está mais na vertical
-            direcoes_prioritarias.append(Direcao.SUL if dy > 0 else Direcao.NORTE)
-            direcoes_prioritarias.append(Direcao.ESTE if dx > 0 else Direcao.OESTE)
-
-        # Adicionar direções restantes como fallback
-        todas_direcoes = [d for d in Direcao if d != Direcao.PARADO]
-        for direcao in todas_direcoes:
-            if direcao not in direcoes_prioritarias:
-                direcoes_prioritarias.append(direcao)
-
-        # Escolher primeira direção válida (sem obstáculo)
-        for direcao in direcoes_prioritarias:
-            if not obstaculos[direcao.name]:
-                return Acao("mover", {'direcao': direcao})
-
-        # Se todas as direções têm obstáculos, ficar parado
-        return Acao("mover", {'direcao': Direcao.PARADO})
-
-    def executar_simulacao_avancada(self, max_passos: int = 20):
-        """Executa uma simulação mais avançada com diferentes estratégias"""
-        print(f"\n🔬 SIMULAÇÃO AVANÇADA - ESTRATÉGIAS DIFERENTES")
-        print("=" * 50)
+        """Escolhe uma ação inteligente baseada na observação
+
+        Direção principal do farol, depois a secundária e, por fim, a primeira
+        direção livre (NORTE, SUL, ESTE, OESTE); parado se todas bloqueadas.
+        """
+        return _acao_estrategia(obs, _ESTRATEGIA_INTELIGENTE)
+
+    def executar_simulacao_avancada(self, max_passos: int = 20, delay_s: float = 0.0,
+                                    verbose: bool = True):
+        """
+        Executa uma simulação mais avançada com diferentes estratégias
+
+        Args:
+            max_passos: Número máximo de passos
+            delay_s: Pausa após cada passo, em segundos (0 = sem pausa)
+            verbose: Mostrar o detalhe de cada passo
+        """
+        if verbose:
+            print(f"\n🔬 SIMULAÇÃO AVANÇADA - ESTRATÉGIAS DIFERENTES")
+            print("=" * 50)
 
         # Estratégias diferentes para cada agente
         estrategias = {
@@ -166,26 +242,33 @@ class TestadorFarol:
             "agente2": "cautelosa"  # Evita obstáculos mais agressivamente
         }
 
+        agente_ids = tuple(self.ambiente.agentes)
+
         for passo in range(max_passos):
-            print(f"\n--- PASSO {passo} ---")
+            if verbose:
+                print(f"\n--- PASSO {passo} ---")
 
             if self.ambiente.terminado:
-                print("🎉 Todos os agentes chegaram ao farol!")
+                if verbose:
+                    print("🎉 Todos os agentes chegaram ao farol!")
                 break
 
-            for agente_id in list(self.ambiente.agentes.keys()):
+            for agente_id in agente_ids:
                 estrategia = estrategias.get(agente_id, "direta")
-                self._processar_agente_com_estrategia(agente_id, passo, estrategia)
+                self._processar_agente_com_estrategia(agente_id, passo, estrategia, verbose)
 
             self.ambiente.atualizacao()
-            time.sleep(0.5)
+            if delay_s:
+                time.sleep(delay_s)
 
-    def _processar_agente_com_estrategia(self, agente_id: str, passo: int, estrategia: str):
+    def _processar_agente_com_estrategia(self, agente_id: str, passo: int, estrategia: str,
+                                         verbose: bool = True):
         """Processa agente com estratégia específica"""
         obs = self.ambiente.observacao_para(agente_id)
-        pos_atual = self.ambiente.obter_posicao_agente(agente_id)
 
-        print(f"\n🔍 {agente_id} [{estrategia}] em {pos_atual}:")
+        if verbose:
+            pos_atual = self.ambiente.obter_posicao_agente(agente_id)
+            print(f"\n🔍 {agente_id} [{estrategia}] em {pos_atual}:")
 
         if estrategia == "direta":
             acao = self._estrategia_direta(obs)
@@ -193,61 +276,20 @@ class TestadorFarol:
             acao = self._estrategia_cautelosa(obs)
 
         recompensa = self.ambiente.agir(acao, agente_id)
-        nova_pos = self.ambiente.obter_posicao_agente(agente_id)
 
-        print(f"   🎯 Ação: {acao.tipo} {acao.parametros.get('direcao', 'PARADO').name}")
-        print(f"   📍 Nova posição: {nova_pos}")
-        print(f"   💰 Recompensa: {recompensa:.2f}")
+        if verbose:
+            nova_pos = self.ambiente.obter_posicao_agente(agente_id)
+            print(f"   🎯 Ação: {acao.tipo} {acao.parametros.get('direcao', 'PARADO').name}")
+            print(f"   📍 Nova posição: {nova_pos}")
+            print(f"   💰 Recompensa: {recompensa:.2f}")
 
     def _estrategia_direta(self, obs: Observacao) -> Acao:
-        """Estratégia: sempre tenta ir direto ao farol"""
-        dx, dy = obs.dados['direcao_farol']
-        obstaculos = obs.dados['obstaculos_vizinhos']
-
-        if abs(dx) > abs(dy):
-            direcao_principal = Direcao.ESTE if dx > 0 else Direcao.OESTE
-        else:
-            direcao_principal = Direcao.SUL if dy > 0 else Direcao.NORTE
-
-        if not obstaculos[direcao_principal.name]:
-            return Acao("mover", {'direcao': direcao_principal})
-
-        # Se obstáculo na direção principal, tentar perpendicular
-        if direcao_principal in [Direcao.NORTE, Direcao.SUL]:
-            alternativas = [Direcao.ESTE, Direcao.OESTE]
-        else:
-            alternativas = [Direcao.NORTE, Direcao.SUL]
-
-        for direcao in alternativas:
-            if not obstaculos[direcao.name]:
-                return Acao("mover", {'direcao': direcao})
-
-        return Acao("mover", {'direcao': Direcao.PARADO})
+        """Estratégia: sempre tenta ir direto ao farol (ou perpendicular, se bloqueado)"""
+        return _acao_estrategia(obs, _ESTRATEGIA_DIRETA)
 
     def _estrategia_cautelosa(self, obs: Observacao) -> Acao:
-        """Estratégia: mais cautelosa, evita ficar preso"""
-        dx, dy = obs.dados['direcao_farol']
-        obstaculos = obs.dados['obstaculos_vizinhos']
-
-        # Lista de direções ordenadas por preferência
-        if dx > 0 and dy > 0:
-            # Farol no quadrante SE
-            preferencias = [Direcao.ESTE, Direcao.SUL, Direcao.NORTE, Direcao.OESTE]
-        elif dx > 0 and dy < 0:
-            # Farol no quadrante NE
-            preferencias = [Direcao.ESTE, Direcao.NORTE, Direcao.SUL, Direcao.OESTE]
-        elif dx < 0 and dy > 0:
-            # Farol no quadrante SO
-            preferencias = [Direcao.OESTE, Direcao.SUL, Direcao.NORTE, Direcao.ESTE]
-        else:
-            # Farol no quadrante NO
-            preferencias = [Direcao.OESTE, Direcao.NORTE, Direcao.SUL, Direcao.ESTE]
-
-        for direcao in preferencias:
-            if not obstaculos[direcao.name]:
-                return Acao("mover", {'direcao': direcao})
-
-        return Acao("mover", {'direcao': Direcao.PARADO})
+        """Estratégia: mais cautelosa, evita ficar preso (preferências por quadrante)"""
+        return _acao_estrategia(obs, _ESTRATEGIA_CAUTELOSA)
 
     def mostrar_resultados_detalhados(self):
         """Mostra resultados detalhados da simulação"""
@@ -271,7 +313,7 @@ class TestadorFarol:
 
         print(f"\n📈 EVOLUÇÃO DAS DISTÂNCIAS:")
         distancias = metricas['distancias_medias']
-        if distancias:
+        if len(distancias) > 0:
             print(f"  Distância inicial: {distancias[0]:.1f}")
             print(f"  Distância final: {distancias[-1]:.1f}")
             print(f"  Melhoria: {distancias[0] - distancias[-1]:.1f}")
@@ -323,7 +365,7 @@ class TestadorFarol:
                         'E': Direcao.ESTE, 'O': Direcao.OESTE, 'P': Direcao.PARADO}
 
             if comando in direcoes:
-                acao = Acao("mover", {'direcao': direcoes[comando]})
+                acao = Acao.mover(direcoes[comando])
                 recompensa = self.ambiente.agir(acao, agente_id)
                 print(f"💰 Recompensa: {recompensa:.2f}")
             else:
@@ -359,11 +401,8 @@ def main():
         # 3. Mostrar estado inicial
         testador.mostrar_estado_inicial()
 
-        # Pequena pausa
-        time.sleep(1)
-
-        # 4. Executar simulação básica
-        terminado = testador.executar_simulacao_basica(max_passos=12)
+        # 4. Executar simulação básica (com pausa para acompanhar no terminal)
+        terminado = testador.executar_simulacao_basica(max_passos=12, delay_s=PAUSA_INTERATIVA)
 
         if not terminado:
             # 5. Se não terminou, mostrar opções adicionais
@@ -376,7 +415,7 @@ def main():
             opcao = input("\nEscolha (1-3): ").strip()
 
             if opcao == "1":
-                testador.executar_simulacao_avancada(max_passos=10)
+                testador.executar_simulacao_avancada(max_passos=10, delay_s=PAUSA_INTERATIVA)
             elif opcao == "2":
                 testador.teste_movimentos_manuais()
 
@@ -395,7 +434,4 @@ def main():
 
 
 if __name__ == "__main__":
-    # Pequeno delay para melhor visualização
-    print("Iniciando teste do Farol em 2 segundos...")
-    time.sleep(2)
     sys.exit(main())
\ No newline at end of file
@@ -8,11 +8,16 @@ Implementações específicas: agenteqlearning.py, agentegenetico.py
 """
 
 from abc import ABC, abstractmethod
-from typing import Dict, Any, Optional, List, Set, Tuple
-from threading import Thread, Lock
+from typing import Dict, Any, Optional, List, Set, Tuple, Deque, Mapping
+from collections import deque
+from dataclasses import dataclass
+from functools import lru_cache
+from types import MappingProxyType
+from threading import Lock
 import json
 import random
-from ambiente import Observacao, Acao, Posicao, Direcao
+import numpy as np
+from ambiente import Ambiente, Observacao, Acao, Posicao, Direcao, njit, NUMBA_DISPONIVEL
 
 
 # ============================================================================
@@ -58,24 +63,237 @@ class SensorObstaculos(Sensor):
         return dados
 
 
+@dataclass(frozen=True, slots=True)
 class Mensagem:
-    """Mensagem entre agentes"""
-    def __init__(self, remetente: str, destinatario: str, conteudo: Any, tipo: str = "info"):
-        self.remetente = remetente
-        self.destinatario = destinatario
-        self.conteudo = conteudo
-        self.tipo = tipo
+    """Mensagem entre agentes (valor imutável, sem __dict__ por instância)"""
+    remetente: str
+    destinatario: str
+    conteudo: Any
+    tipo: str = "info"
+
+
+# ============================================================================
+# HISTÓRICO DE AÇÕES
+# ============================================================================
+
+# Direções de movimento (sem PARADO), pela ordem usada nas políticas
+_DIRECOES_MOVEIS = (Direcao.NORTE, Direcao.SUL, Direcao.ESTE, Direcao.OESTE)
+
+# Direções de _DIRECOES_MOVEIS presentes em cada máscara de 4 bits (bit i = _DIRECOES_MOVEIS[i])
+_DIRECOES_POR_MASCARA = tuple(
+    tuple(direcao for bit, direcao in enumerate(_DIRECOES_MOVEIS) if mascara >> bit & 1)
+    for mascara in range(16))
+
+# Nome de cada direção (chave em 'obstaculos_vizinhos'), sem aceder a Direcao.name
+_NOMES_DIRECOES = {direcao: direcao.name for direcao in Direcao}
+
+# 'obstaculos_vizinhos' por omissão, partilhado (só de leitura)
+_SEM_OBSTACULOS = MappingProxyType({})
+
+# Tipos de ação guardados no histórico pelo seu índice (255 = outro tipo)
+TIPOS_ACAO = ("mover", "recolher", "depositar")
+_CODIGOS_TIPO_ACAO = {tipo: codigo for codigo, tipo in enumerate(TIPOS_ACAO)}
+_CODIGO_TIPO_OUTRO = 255
+
+DTYPE_ACAO = np.dtype([('tipo', 'u1'), ('dx', 'i1'), ('dy', 'i1'), ('t', 'i4')])
+
+
+class HistoricoAcoes:
+    """Buffer circular de ações num array estruturado (tipo, dx, dy, passo)"""
+
+    CAPACIDADE = 1024
+
+    def __init__(self, capacidade: int = None):
+        self._dados = np.zeros(capacidade or self.CAPACIDADE, dtype=DTYPE_ACAO)
+        self._total = 0
+
+    def append(self, acao: Acao, passo: int = 0):
+        """Regista uma ação; acima da capacidade substitui a mais antiga"""
+        dx, dy = acao.direcao.value
+        self._dados[self._total % len(self._dados)] = (
+            _CODIGOS_TIPO_ACAO.get(acao.tipo, _CODIGO_TIPO_OUTRO), dx, dy, passo)
+        self._total += 1
+
+    def clear(self):
+        self._total = 0
+
+    def redimensionar(self, capacidade: int):
+        """Realoca o buffer com outra capacidade (descarta o conteúdo)"""
+        self._dados = np.zeros(max(1, capacidade), dtype=DTYPE_ACAO)
+        self._total = 0
+
+    def obter(self) -> np.ndarray:
+        """Cópia das ações guardadas, da mais antiga para a mais recente"""
+        capacidade = len(self._dados)
+        if self._total <= capacidade:
+            return self._dados[:self._total].copy()
+        inicio = self._total % capacidade
+        return np.concatenate((self._dados[inicio:], self._dados[:inicio]))
+
+    def __len__(self):
+        # Total de ações registadas, mesmo as que já saíram do buffer
+        return self._total
+
+
+# ============================================================================
+# NOVELTY SEARCH
+# ============================================================================
+
+def codificar_comportamento(behavior: Set[Tuple[int, int]]) -> np.ndarray:
+    """Células visitadas como array ordenado de uint32 ((x << 16) | y, como Posicao.__hash__)"""
+    codigos = np.fromiter((((x & 0xFFFF) << 16) | (y & 0xFFFF) for x, y in behavior),
+                          dtype=np.uint32, count=len(behavior))
+    codigos.sort()
+    return codigos
+
+
+# A partir de quantos comportamentos compensa chamar o kernel compilado
+_LIMIAR_NUMBA = 32
+
+
+@njit(cache=True)
+def _distancias_jaccard_ordenadas(codigos, todos, limites):
+    """Jaccard por fusão de arrays ordenados; o comportamento i é todos[limites[i]:limites[i+1]]"""
+    n = len(limites) - 1
+    distancias = np.zeros(n, dtype=np.float64)
+    for i in range(n):
+        a, fim_a = 0, len(codigos)
+        b, fim_b = limites[i], limites[i + 1]
+        intersecao = 0
+        while a < fim_a and b < fim_b:
+            if codigos[a] == todos[b]:
+                intersecao += 1
+                a += 1
+                b += 1
+            elif codigos[a] < todos[b]:
+                a += 1
+            else:
+                b += 1
+        uniao = fim_a + (fim_b - limites[i]) - intersecao
+        if uniao > 0:
+            distancias[i] = 1.0 - intersecao / uniao
+    return distancias
+
+
+def distancias_jaccard(codigos: np.ndarray, outros: List[np.ndarray]) -> np.ndarray:
+    """Distâncias de Jaccard de um comportamento codificado a vários, numa só passagem"""
+    if not outros:
+        return np.empty(0, dtype=np.float64)
+    tamanhos = np.fromiter((len(c) for c in outros), dtype=np.int64, count=len(outros))
+    todos = np.concatenate(outros)
+    if NUMBA_DISPONIVEL and len(outros) >= _LIMIAR_NUMBA:
+        limites = np.zeros(len(outros) + 1, dtype=np.int64)
+        np.cumsum(tamanhos, out=limites[1:])
+        return _distancias_jaccard_ordenadas(codigos, todos, limites)
+    # Dono de cada célula em 'todos'; as interseções contam-se por dono
+    donos = np.repeat(np.arange(len(outros)), tamanhos)
+    comuns = np.isin(todos, codigos)
+    intersecao = np.bincount(donos[comuns], minlength=len(outros))
+    uniao = tamanhos + len(codigos) - intersecao
+    distancias = np.zeros(len(outros), dtype=np.float64)
+    np.divide(intersecao, uniao, out=distancias, where=uniao > 0)
+    return np.subtract(1.0, distancias, out=distancias, where=uniao > 0)
+
+
+def codificar_comportamento_bits(behavior: Set[Tuple[int, int]], largura: int,
+                                 altura: int) -> Optional[np.ndarray]:
+    """
+    Células visitadas como bitmap de largura*altura bits (célula x*altura + y) em palavras uint64
+
+    Devolve None se alguma célula estiver fora da grelha (agentes que já
+    chegaram ao objetivo podem sair dela): o bitmap não a conseguiria
+    representar sem a confundir com outra célula.
+    """
+    bits = np.zeros((largura * altura + 63) // 64, dtype=np.uint64)
+    if behavior:
+        xy = np.fromiter((c for celula in behavior for c in celula),
+                         dtype=np.int64, count=2 * len(behavior)).reshape(-1, 2)
+        x, y = xy[:, 0], xy[:, 1]
+        if x.min() < 0 or y.min() < 0 or x.max() >= largura or y.max() >= altura:
+            return None
+        indices = (x * altura + y).astype(np.uint64)
+        np.bitwise_or.at(bits, indices >> np.uint64(6), np.uint64(1) << (indices & np.uint64(63)))
+    return bits
+
+
+# Marca, em Agente._behavior_bits, um comportamento com células fora da grelha
+_FORA_DA_GRELHA = np.empty(0, dtype=np.uint64)
+
+
+if hasattr(np, 'bitwise_count'):
+    def _contar_bits(palavras: np.ndarray) -> np.ndarray:
+        """Número de bits a 1 em cada linha de uma matriz de palavras uint64"""
+        return np.bitwise_count(palavras).sum(axis=-1, dtype=np.int64)
+else:  # NumPy < 2.0
+    def _contar_bits(palavras: np.ndarray) -> np.ndarray:
+        """Número de bits a 1 em cada linha de uma matriz de palavras uint64"""
+        bytes_ = palavras.view(np.uint8).reshape(palavras.shape[:-1] + (-1,))
+        return np.unpackbits(bytes_, axis=-1).sum(axis=-1, dtype=np.int64)
+
+
+def distancias_jaccard_bits(bits: np.ndarray, outros: np.ndarray) -> np.ndarray:
+    """Distâncias de Jaccard de um bitmap às linhas de uma matriz de bitmaps do mesmo tamanho"""
+    intersecao = _contar_bits(outros & bits)
+    uniao = _contar_bits(outros | bits)
+    distancias = np.zeros(len(outros), dtype=np.float64)
+    np.divide(intersecao, uniao, out=distancias, where=uniao > 0)
+    return np.subtract(1.0, distancias, out=distancias, where=uniao > 0)
+
+
+def media_k_menores(distancias: np.ndarray, k: int) -> float:
+    """Média das k menores distâncias (seleção parcial em O(n), sem ordenar tudo)"""
+    k = min(k, len(distancias))
+    if k == 0:
+        return 0.0
+    if k < len(distancias):
+        distancias = np.partition(distancias, k - 1)[:k]
+    return float(distancias.mean())
+
+
+class PopulacaoAgentes:
+    """Fitness de um conjunto de agentes em arrays contíguos (um índice por agente)
+
+    Cada agente guarda só a referência à população e o seu índice; novelty_score,
+    objective_fitness e fitness_total são propriedades que leem e escrevem aqui.
+    Um agente novo pertence a uma população só sua até ser ligado a outra.
+    """
+
+    def __init__(self, agentes: List['Agente']):
+        n = len(agentes)
+        self.novelty_scores = np.zeros(n, dtype=np.float64)
+        self.objective_fitness = np.zeros(n, dtype=np.float64)
+        self.fitness_total = np.zeros(n, dtype=np.float64)
+        for indice, agente in enumerate(agentes):
+            anterior = getattr(agente, '_pop', None)
+            if anterior is not None:
+                # Preserva os valores que o agente já tinha
+                self.novelty_scores[indice] = agente.novelty_score
+                self.objective_fitness[indice] = agente.objective_fitness
+                self.fitness_total[indice] = agente.fitness_total
+            agente._pop, agente._idx = self, indice
+
+    def __len__(self):
+        return len(self.fitness_total)
+
+    def calcular_fitness(self, peso_novidade: float = 0.5):
+        """Fitness total de todos os agentes numa só operação"""
+        np.add(self.novelty_scores * peso_novidade,
+               self.objective_fitness * (1 - peso_novidade),
+               out=self.fitness_total)
+
+    def ordem_por_fitness(self) -> np.ndarray:
+        """Índices por fitness total decrescente (empates mantêm a ordem original)"""
+        return np.argsort(-self.fitness_total, kind='stable')
 
 
 # ============================================================================
 # AGENTE BASE
 # ============================================================================
 
-class Agente(ABC, Thread):
+class Agente(ABC):
     """Classe base para todos os agentes"""
     
     def __init__(self, agente_id: str, parametros: Dict[str, Any] = None, genotype: List[Direcao] = None):
-        Thread.__init__(self)
         self.agente_id = agente_id
         self.parametros = parametros or {}
         self.genotype = genotype
@@ -85,19 +303,26 @@ class Agente(ABC, Thread):
         self.posicao_atual: Optional[Posicao] = None
         self.observacao_atual: Optional[Observacao] = None
         
-        # Histórico
-        self.historico_observacoes: List[Observacao] = []
-        self.historico_acoes: List[Acao] = []
+        # Histórico: só as últimas 'tamanho_historico' observações e posições
+        # (por omissão as mesmas que o ambiente; 0 não guarda nenhuma; o
+        # comprimento do caminho conta sempre)
+        tamanho_historico = self.parametros.get('tamanho_historico', Ambiente.TAMANHO_HISTORICO)
+        self._guardar_historico = tamanho_historico > 0
+        self.historico_observacoes: Deque[Observacao] = deque(maxlen=tamanho_historico)
+        self.historico_acoes = HistoricoAcoes()
         self.recompensa_acumulada: float = 0.0
         
         # Comportamento (Novelty Search)
         self.behavior: Set[Tuple[int, int]] = set()
-        self.path: List[Tuple[int, int]] = []
+        self._behavior_arr: Optional[np.ndarray] = None  # ver behavior_arr
+        self._behavior_bits: Optional[np.ndarray] = None  # ver behavior_bits
+        self.path: Deque[Tuple[int, int]] = deque(maxlen=tamanho_historico)
+        self.passos_caminho = 0
         
-        # Fitness
-        self.novelty_score: float = 0.0
-        self.objective_fitness: float = 0.0
-        self.fitness_total: float = 0.0
+        # Fitness (em PopulacaoAgentes; ver as propriedades correspondentes)
+        self._pop: Optional[PopulacaoAgentes] = None
+        self._idx = 0
+        PopulacaoAgentes([self])
         
         # Sensores e comunicação
         self.sensores: List[Sensor] = []
@@ -114,13 +339,18 @@ class Agente(ABC, Thread):
     def observacao(self, obs: Observacao, recompensa: float = 0.0):
         """Recebe observação e recompensa"""
         self.observacao_atual = obs
-        self.historico_observacoes.append(obs)
+        if self._guardar_historico:
+            self.historico_observacoes.append(obs)
         self.recompensa_acumulada += recompensa
         
         if 'posicao_atual' in obs.dados:
             pos = tuple(obs.dados['posicao_atual'])
-            self.behavior.add(pos)
-            self.path.append(pos)
+            if pos not in self.behavior:
+                self.behavior.add(pos)
+                self._behavior_arr = self._behavior_bits = None
+            self.passos_caminho += 1
+            if self._guardar_historico:
+                self.path.append(pos)
             self.posicao_atual = Posicao(*pos)
     
     def instala(self, ambiente, posicao: Posicao = None) -> Observacao:
@@ -169,7 +399,9 @@ class Agente(ABC, Thread):
         self.historico_acoes.clear()
         self.recompensa_acumulada = 0.0
         self.behavior.clear()
+        self._behavior_arr = self._behavior_bits = None
         self.path.clear()
+        self.passos_caminho = 0
         self.novelty_score = 0.0
         self.objective_fitness = 0.0
         self.fitness_total = 0.0
@@ -183,7 +415,7 @@ class Agente(ABC, Thread):
             'recompensa_acumulada': self.recompensa_acumulada,
             'num_acoes': len(self.historico_acoes),
             'espacos_explorados': len(self.behavior),
-            'distancia_percorrida': len(self.path),
+            'distancia_percorrida': self.passos_caminho,
             'novelty_score': self.novelty_score,
             'objective_fitness': self.objective_fitness,
             'fitness_total': self.fitness_total
@@ -195,15 +427,63 @@ class Agente(ABC, Thread):
             self.novelty_score = 0.0
             return
         
-        distancias = [self._jaccard_distance(self.behavior, a.behavior) 
-                      for a in populacao 
-                      if a.agente_id != self.agente_id and a.behavior]
-        
-        if distancias:
-            k_proximos = sorted(distancias)[:min(k_vizinhos, len(distancias))]
-            self.novelty_score = sum(k_proximos) / len(k_proximos)
+        outros = [a for a in populacao if a.agente_id != self.agente_id and a.behavior]
+        bits = self.behavior_bits
+        if (bits is not None and
+                all(a.ambiente is self.ambiente and a.behavior_bits is not None for a in outros)):
+            # Mesma grelha e todas as células dentro dela: bitmaps comparáveis,
+            # distâncias por AND/OR + contagem de bits
+            matriz = (np.stack([a.behavior_bits for a in outros]) if outros
+                      else np.empty((0, len(bits)), dtype=bits.dtype))
+            distancias = distancias_jaccard_bits(bits, matriz)
         else:
-            self.novelty_score = 0.0
+            distancias = distancias_jaccard(self.behavior_arr, [a.behavior_arr for a in outros])
+        self.novelty_score = media_k_menores(distancias, k_vizinhos)
+    
+    @property
+    def novelty_score(self) -> float:
+        return float(self._pop.novelty_scores[self._idx])
+
+    @novelty_score.setter
+    def novelty_score(self, valor: float):
+        self._pop.novelty_scores[self._idx] = valor
+
+    @property
+    def objective_fitness(self) -> float:
+        return float(self._pop.objective_fitness[self._idx])
+
+    @objective_fitness.setter
+    def objective_fitness(self, valor: float):
+        self._pop.objective_fitness[self._idx] = valor
+
+    @property
+    def fitness_total(self) -> float:
+        return float(self._pop.fitness_total[self._idx])
+
+    @fitness_total.setter
+    def fitness_total(self, valor: float):
+        self._pop.fitness_total[self._idx] = valor
+
+    @property
+    def behavior_bits(self) -> Optional[np.ndarray]:
+        """
+        behavior como bitmap da grelha do ambiente
+
+        None se o agente não estiver instalado ou se tiver visitado células
+        fora da grelha; nesse caso usa-se behavior_arr.
+        """
+        if self._behavior_bits is None and self.ambiente is not None:
+            bits = codificar_comportamento_bits(
+                self.behavior, self.ambiente.largura, self.ambiente.altura)
+            self._behavior_bits = _FORA_DA_GRELHA if bits is None else bits
+        return None if self._behavior_bits is _FORA_DA_GRELHA else self._behavior_bits
+    
+    @property
+    def behavior_arr(self) -> np.ndarray:
+        """behavior codificado (ver codificar_comportamento), reconstruído só após mudanças"""
+        if self._behavior_arr is None:
+            self._behavior_arr = codificar_comportamento(self.behavior)
+        return self._behavior_arr
     
     @staticmethod
     def _jaccard_distance(set1: Set, set2: Set) -> float:
@@ -224,9 +504,25 @@ class Agente(ABC, Thread):
 # AGENTE REATIVO
 # ============================================================================
 
+# Índices em _DIRECOES_MOVEIS usados na escolha vetorizada de direções
+_NORTE, _SUL, _ESTE, _OESTE = range(4)
+
+
+def direcoes_alvo_lote(dx: np.ndarray, dy: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Direção principal e secundária (índices em _DIRECOES_MOVEIS) para N vetores até ao alvo"""
+    horizontal = np.abs(dx) > np.abs(dy)
+    este_oeste = np.where(dx > 0, _ESTE, _OESTE)
+    sul_norte = np.where(dy > 0, _SUL, _NORTE)
+    return (np.where(horizontal, este_oeste, sul_norte),
+            np.where(horizontal, sul_norte, este_oeste))
+
+
 class AgenteReativo(Agente):
     """Agente com política fixa"""
     
+    # Abaixo deste número de agentes, age_lote decide agente a agente
+    LIMIAR_LOTE = 8
+    
     def __init__(self, agente_id: str, parametros: Dict[str, Any] = None):
         super().__init__(agente_id, parametros)
         self.politica_fixa = parametros.get('politica', 'ir_para_farol') if parametros else 'ir_para_farol'
@@ -234,7 +530,7 @@ class AgenteReativo(Agente):
         self.ultimas_posicoes = []  # Últimas 5 posições
         self.max_memoria = 5
     
-    def _evitar_loop(self, direcao: Direcao, dados: Dict) -> Optional[Direcao]:
+    def _evitar_loop(self, direcao: Direcao, obstaculos: Mapping[str, bool]) -> Optional[Direcao]:
         """Verifica se movimento causaria loop e sugere alternativa"""
         if not self.posicao_atual:
             return direcao
@@ -246,26 +542,61 @@ class AgenteReativo(Agente):
         # Verificar se já esteve nesta posição recentemente
         if nova_pos_tupla in self.ultimas_posicoes:
             # Tentar direções alternativas que não causem loop
-            obstaculos = dados.get('obstaculos_vizinhos', {})
-            direcoes_ordenadas = [Direcao.NORTE, Direcao.SUL, Direcao.ESTE, Direcao.OESTE]
-            
-            for dir_alt in direcoes_ordenadas:
+            for dir_alt in _DIRECOES_MOVEIS:
                 if dir_alt == direcao:
                     continue
                 pos_alt = self.posicao_atual.mover(dir_alt)
                 pos_alt_tupla = (pos_alt.x, pos_alt.y)
-                if (not obstaculos.get(dir_alt.name, False) and 
+                if (not obstaculos.get(_NOMES_DIRECOES[dir_alt], False) and 
                     pos_alt_tupla not in self.ultimas_posicoes):
                     return dir_alt
         
         return direcao
     
-    def age(self) -> Acao:
-        """Decide ação baseada na política fixa"""
+    @classmethod
+    def age_lote(cls, agentes: List['AgenteReativo']) -> List[Acao]:
+        """
+        Decide as ações de vários agentes reativos, pela ordem dada
+        
+        As direções principal e secundária até ao alvo (Farol/Labirinto) são
+        calculadas para todos de uma vez; obstáculos, memória de posições e
+        movimento aleatório continuam a ser tratados por agente, na mesma
+        ordem, pelo que o resultado é igual a chamar age() em cada um.
+        """
+        if len(agentes) < cls.LIMIAR_LOTE:
+            return [agente.age() for agente in agentes]
+        
+        alvos = [agente._direcao_alvo() for agente in agentes]
+        com_alvo = [i for i, alvo in enumerate(alvos) if alvo is not None]
+        direcoes: List[Optional[Tuple[Direcao, Direcao]]] = [None] * len(agentes)
+        if com_alvo:
+            vetores = np.array([alvos[i] for i in com_alvo], dtype=np.int64)
+            principais, secundarias = direcoes_alvo_lote(vetores[:, 0], vetores[:, 1])
+            for i, p, s in zip(com_alvo, principais.tolist(), secundarias.tolist()):
+                direcoes[i] = (_DIRECOES_MOVEIS[p], _DIRECOES_MOVEIS[s])
+        return [agente.age(d) for agente, d in zip(agentes, direcoes)]
+    
+    def _direcao_alvo(self) -> Optional[Tuple[int, int]]:
+        """Vetor (dx, dy) até ao farol ou fim do labirinto, se a observação o tiver"""
+        if not self.observacao_atual:
+            return None
+        dados = self.observacao_atual.dados
+        if 'direcao_farol' in dados or 'direcao_fim' in dados:
+            return dados.get('direcao_farol') or dados.get('direcao_fim')
+        return None
+    
+    def age(self, direcoes: Optional[Tuple[Direcao, Direcao]] = None) -> Acao:
+        """
+        Decide ação baseada na política fixa
+        
+        Args:
+            direcoes: (principal, secundária) até ao alvo, já calculadas por age_lote
+        """
         if not self.observacao_atual:
-            return Acao("mover", {'direcao': Direcao.PARADO})
+            return Acao.mover(Direcao.PARADO)
         
         dados = self.observacao_atual.dados
+        obstaculos = dados.get('obstaculos_vizinhos', _SEM_OBSTACULOS)
         
         # Atualizar memória de posições
         if self.posicao_atual:
@@ -281,39 +612,39 @@ class AgenteReativo(Agente):
             
             # Se já chegou, parar
             if dx == 0 and dy == 0:
-                return Acao("mover", {'direcao': Direcao.PARADO})
+                return Acao.mover(Direcao.PARADO)
             
             # Escolher direção principal (priorizar maior componente)
-            if abs(dx) > abs(dy):
+            if direcoes is not None:
+                direcao_principal, direcao_secundaria = direcoes
+            elif abs(dx) > abs(dy):
                 direcao_principal = Direcao.ESTE if dx > 0 else Direcao.OESTE
                 direcao_secundaria = Direcao.SUL if dy > 0 else Direcao.NORTE
             else:
                 direcao_principal = Direcao.SUL if dy > 0 else Direcao.NORTE
                 direcao_secundaria = Direcao.ESTE if dx > 0 else Direcao.OESTE
             
-            obstaculos = dados.get('obstaculos_vizinhos', {})
-            
             # Tentar direção principal
-            if not obstaculos.get(direcao_principal.name, False):
-                direcao_final = self._evitar_loop(direcao_principal, dados)
+            if not obstaculos.get(_NOMES_DIRECOES[direcao_principal], False):
+                direcao_final = self._evitar_loop(direcao_principal, obstaculos)
                 if direcao_final:
-                    return Acao("mover", {'direcao': direcao_final})
+                    return Acao.mover(direcao_final)
             
             # Tentar direção secundária
-            if not obstaculos.get(direcao_secundaria.name, False):
-                direcao_final = self._evitar_loop(direcao_secundaria, dados)
+            if not obstaculos.get(_NOMES_DIRECOES[direcao_secundaria], False):
+                direcao_final = self._evitar_loop(direcao_secundaria, obstaculos)
                 if direcao_final:
-                    return Acao("mover", {'direcao': direcao_final})
+                    return Acao.mover(direcao_final)
             
             # Se ambas bloqueadas, tentar outras direções (evitando loops)
-            for dir_alt in [Direcao.NORTE, Direcao.SUL, Direcao.ESTE, Direcao.OESTE]:
-                if (not obstaculos.get(dir_alt.name, False) and
+            for dir_alt in _DIRECOES_MOVEIS:
+                if (not obstaculos.get(_NOMES_DIRECOES[dir_alt], False) and
                     dir_alt != direcao_principal and dir_alt != direcao_secundaria):
-                    direcao_final = self._evitar_loop(dir_alt, dados)
+                    direcao_final = self._evitar_loop(dir_alt, obstaculos)
                     if direcao_final and direcao_final != dir_alt:
-                        return Acao("mover", {'direcao': direcao_final})
+                        return Acao.mover(direcao_final)
                     elif direcao_final:
-                        return Acao("mover", {'direcao': direcao_final})
+                        return Acao.mover(direcao_final)
         
         # Política para ambiente Foraging
         elif 'recursos_proximos' in dados or 'ninhos_proximos' in dados:
@@ -337,9 +668,8 @@ class AgenteReativo(Agente):
                     else:
                         direcao = Direcao.SUL if dy > 0 else Direcao.NORTE
                     
-                    obstaculos = dados.get('obstaculos_vizinhos', {})
-                    if not obstaculos.get(direcao.name, False):
-                        return Acao("mover", {'direcao': direcao})
+                    if not obstaculos.get(_NOMES_DIRECOES[direcao], False):
+                        return Acao.mover(direcao)
             else:
                 # Se não tem recurso, procurar recursos
                 if dados.get('pode_recolher', False):
@@ -358,23 +688,26 @@ class AgenteReativo(Agente):
                         else:
                             direcao = Direcao.SUL if dy > 0 else Direcao.NORTE
                         
-                        obstaculos = dados.get('obstaculos_vizinhos', {})
-                        if not obstaculos.get(direcao.name, False):
-                            return Acao("mover", {'direcao': direcao})
+                        if not obstaculos.get(_NOMES_DIRECOES[direcao], False):
+                            return Acao.mover(direcao)
         
         # Fallback: movimento aleatório (evitando loops)
-        direcoes_validas = []
-        obstaculos = dados.get('obstaculos_vizinhos', {})
-        for dir in [Direcao.NORTE, Direcao.SUL, Direcao.ESTE, Direcao.OESTE]:
-            if not obstaculos.get(dir.name, False):
-                direcao_final = self._evitar_loop(dir, dados)
-                if direcao_final:
-                    direcoes_validas.append(direcao_final)
+        mascara = 0
+        for bit, dir in enumerate(_DIRECOES_MOVEIS):
+            if not obstaculos.get(_NOMES_DIRECOES[dir], False):
+                mascara |= 1 << bit
+        if not mascara:
+            return Acao.mover(Direcao.PARADO)
         
-        if direcoes_validas:
-            return Acao("mover", {'direcao': random.choice(direcoes_validas)})
-        else:
-            return Acao("mover", {'direcao': Direcao.PARADO})
+        # Direções livres (tuplo partilhado); só se copia se alguma for trocada
+        livres = direcoes_validas = _DIRECOES_POR_MASCARA[mascara]
+        for i, dir in enumerate(livres):
+            direcao_final = self._evitar_loop(dir, obstaculos)
+            if direcao_final is not dir:
+                if direcoes_validas is livres:
+                    direcoes_validas = list(livres)
+                direcoes_validas[i] = direcao_final
+        return Acao.mover(direcoes_validas[random.randrange(len(direcoes_validas))])
     
     def reset(self):
         """Reinicia estado incluindo memória de posições"""
@@ -386,33 +719,30 @@ class AgenteReativo(Agente):
 # FÁBRICA DE AGENTES
 # ============================================================================
 
+@lru_cache(maxsize=None)
+def _classe_agente(tipo: str) -> type:
+    """Classe de agente para o tipo; os módulos dos outros agentes só são importados no primeiro pedido"""
+    if tipo == "reativo":
+        return AgenteReativo
+    elif tipo in ("aprendizagem", "qlearning"):
+        from agenteqlearning import AgenteQLearning
+        return AgenteQLearning
+    elif tipo in ("evolucionario", "genetico"):
+        from agentegenetico import AgenteEvolucionario
+        return AgenteEvolucionario
+    else:
+        raise ValueError(f"Tipo não suportado: {tipo}")
+
+
 class FabricaAgentes:
     """Fábrica para criação de agentes"""
     
     @staticmethod
     def criar_agente(tipo: str, agente_id: str, parametros: Dict[str, Any] = None) -> Agente:
         """Cria agente por tipo"""
-        if tipo == "reativo":
-            return AgenteReativo(agente_id, parametros)
-        elif tipo in ["aprendizagem", "qlearning"]:
-            from agenteqlearning import AgenteQLearning
-            return AgenteQLearning(agente_id, parametros)
-        elif tipo in ["evolucionario", "genetico"]:
-            from agentegenetico import AgenteEvolucionario
-            return AgenteEvolucionario(agente_id, parametros)
-        else:
-            raise ValueError(f"Tipo não suportado: {tipo}")
+        return _classe_agente(tipo)(agente_id, parametros)
     
     @staticmethod
     def criar_de_ficheiro(tipo: str, ficheiro_parametros: str) -> Agente:
         """Cria agente de ficheiro"""
-        if tipo == "reativo":
-            return AgenteReativo.cria(ficheiro_parametros)
-        elif tipo in ["aprendizagem", "qlearning"]:
-            from agenteqlearning import AgenteQLearning
-            return AgenteQLearning.cria(ficheiro_parametros)
-        elif tipo in ["evolucionario", "genetico"]:
-            from agentegenetico import AgenteEvolucionario
-            return AgenteEvolucionario.cria(ficheiro_parametros)
-        else:
-            raise ValueError(f"Tipo não suportado: {tipo}")
+        return _classe_agente(tipo).cria(ficheiro_parametros)
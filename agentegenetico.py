@@ -5,7 +5,8 @@ Implementa evolução de populações com busca por novidade
 
 from typing import Dict, Any, List, Set, Tuple
 import random
-from agente import Agente
+import numpy as np
+from agente import Agente, PopulacaoAgentes, distancias_jaccard, distancias_jaccard_bits, media_k_menores
 from ambiente import Observacao, Acao, Direcao, Posicao
 
 
@@ -57,12 +58,12 @@ class AgenteEvolucionario(Agente):
             Ação do genótipo
         """
         if self.passo_atual >= len(self.genotype):
-            return Acao("mover", {'direcao': Direcao.PARADO})
+            return Acao.mover(Direcao.PARADO)
         
         direcao = self.genotype[self.passo_atual]
         self.passo_atual += 1
         
-        return Acao("mover", {'direcao': direcao})
+        return Acao.mover(direcao)
     
     def _generate_random_gene(self) -> Direcao:
         """
@@ -91,7 +92,7 @@ class AgenteEvolucionario(Agente):
         objetivos_bonus = self.objetivos_alcancados * 200
         
         # Penalização por movimentos repetitivos
-        movimento_unico_ratio = len(self.behavior) / max(len(self.path), 1)
+        movimento_unico_ratio = len(self.behavior) / max(self.passos_caminho, 1)
         exploracao_penalty = -100 if movimento_unico_ratio < 0.3 else 0
         
         self.objective_fitness = fitness + exploracao_bonus + recursos_bonus + objetivos_bonus + exploracao_penalty
@@ -343,7 +344,13 @@ class PopulacaoEvolucionaria:
         
         # População e arquivo
         self.populacao: List[AgenteEvolucionario] = []
+        self._fitness_populacao: PopulacaoAgentes = None  # fitness da geração em arrays
         self.arquivo: List[Set[Tuple[int, int]]] = []
+        # Arquivo codificado, pela mesma ordem: códigos ordenados (behavior_arr), sempre
+        # disponíveis, e matriz de bitmaps (behavior_bits), só enquanto todas as
+        # células estiverem dentro da grelha (None depois disso)
+        self._arquivo_codigos: List[np.ndarray] = []
+        self._arquivo_bits: np.ndarray = np.empty((0, 0), dtype=np.uint64)
         self.geracao_atual = 0
         
         # Estatísticas
@@ -398,7 +405,7 @@ class PopulacaoEvolucionaria:
         self._avaliar_populacao()
         
         # 2. Ordenar por fitness combinado
-        self.populacao.sort(key=lambda x: x.combined_fitness, reverse=True)
+        self.populacao = [self.populacao[i] for i in self._fitness_populacao.ordem_por_fitness()]
         
         # 3. Registar estatísticas
         self._registar_estatisticas()
@@ -411,6 +418,7 @@ class PopulacaoEvolucionaria:
     
     def _avaliar_populacao(self):
         """Avalia fitness de todos os indivíduos"""
+        self._fitness_populacao = PopulacaoAgentes(self.populacao)
         for agente in self.populacao:
             # Resetar agente
             agente.reset()
@@ -423,27 +431,24 @@ class PopulacaoEvolucionaria:
             
             # Calcular novidade (usando arquivo de comportamentos)
             if self.arquivo and agente.behavior:
-                # Calcular distância média aos k vizinhos mais próximos no arquivo
-                distancias = []
-                for comportamento_arquivo in self.arquivo:
-                    dist = agente._jaccard_distance(agente.behavior, comportamento_arquivo)
-                    distancias.append(dist)
-                
-                if distancias:
-                    k_proximos = sorted(distancias)[:min(self.k_vizinhos, len(distancias))]
-                    agente.novelty_score = sum(k_proximos) / len(k_proximos) if k_proximos else 0.0
-                else:
-                    agente.novelty_score = 1.0  # Comportamento único se arquivo vazio
+                agente.novelty_score = self._novidade_arquivo(agente)
             elif agente.behavior:
                 agente.novelty_score = 1.0  # Primeiro comportamento é sempre novo
             else:
                 agente.novelty_score = 0.0
-            
-            # Fitness combinado
-            agente.combined_fitness = (
-                agente.novelty_score * self.peso_novidade +
-                agente.objective_fitness * (1.0 - self.peso_novidade)
-            )
+        
+        # Fitness combinado de toda a população
+        self._fitness_populacao.calcular_fitness(self.peso_novidade)
+    
+    def _novidade_arquivo(self, agente: AgenteEvolucionario) -> float:
+        """Distância média do comportamento do agente aos k vizinhos mais próximos no arquivo"""
+        bits = agente.behavior_bits
+        if bits is not None and self._arquivo_bits is not None:
+            distancias = distancias_jaccard_bits(bits, self._arquivo_bits)
+        else:
+            # Células fora da grelha (no agente ou no arquivo): códigos ordenados
+            distancias = distancias_jaccard(agente.behavior_arr, self._arquivo_codigos)
+        return media_k_menores(distancias, self.k_vizinhos)
     
     def _simular_agente(self, agente: AgenteEvolucionario):
         """
@@ -462,7 +467,6 @@ class PopulacaoEvolucionaria:
         for passo in range(agente.num_steps):
             # Agente decide ação
             acao = agente.age()
-            acao.agente_id = agente.agente_id
             
             # Ambiente processa ação
             recompensa = self.ambiente.agir(acao, agente.agente_id)
@@ -481,14 +485,12 @@ class PopulacaoEvolucionaria:
     
     def _registar_estatisticas(self):
         """Registra estatísticas da geração atual"""
-        fitness_totais = [a.combined_fitness for a in self.populacao]
-        novidades = [a.novelty_score for a in self.populacao]
-        objetivos = [a.objective_fitness for a in self.populacao]
+        fitness = self._fitness_populacao
         
-        self.fitness_total_media.append(sum(fitness_totais) / len(fitness_totais))
-        self.fitness_total_maximo.append(max(fitness_totais))
-        self.novidade_media.append(sum(novidades) / len(novidades))
-        self.objetivo_medio.append(sum(objetivos) / len(objetivos))
+        self.fitness_total_media.append(float(fitness.fitness_total.mean()))
+        self.fitness_total_maximo.append(float(fitness.fitness_total.max()))
+        self.novidade_media.append(float(fitness.novelty_scores.mean()))
+        self.objetivo_medio.append(float(fitness.objective_fitness.mean()))
         
         # Diversidade: número de comportamentos únicos
         behaviors_unicos = set()
@@ -507,8 +509,19 @@ class PopulacaoEvolucionaria:
         
         # Adicionar top N ao arquivo
         n_adicionar = min(5, len(pop_ordenada_novelty))
-        for i in range(n_adicionar):
-            self.arquivo.append(pop_ordenada_novelty[i].behavior.copy())
+        novos = pop_ordenada_novelty[:n_adicionar]
+        for agente in novos:
+            self.arquivo.append(agente.behavior.copy())
+            self._arquivo_codigos.append(agente.behavior_arr)
+        
+        if self._arquivo_bits is not None:
+            novos_bits = [agente.behavior_bits for agente in novos]
+            if any(bits is None for bits in novos_bits):
+                self._arquivo_bits = None  # célula fora da grelha: só os códigos servem
+            elif novos_bits:
+                novos_bits = np.stack(novos_bits)
+                self._arquivo_bits = (np.concatenate((self._arquivo_bits, novos_bits))
+                                      if len(self._arquivo_bits) else novos_bits)
     
     def _criar_nova_geracao(self):
         """Cria nova geração através de seleção, crossover e mutação"""
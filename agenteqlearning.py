@@ -5,10 +5,36 @@ Implementa Q-Learning com epsilon-greedy e Q-table
 
 from typing import Dict, Any, Optional, List
 import json
+import math
 import random
 import numpy as np
-from agente import Agente
-from ambiente import Observacao, Acao, Direcao
+from agente import Agente, _DIRECOES_MOVEIS
+from ambiente import Observacao, Acao, Direcao, njit
+
+
+# Setores de 45º da direção do objetivo, pela ordem devolvida por _setor_direcao
+_SETORES_DIRECAO = ("E", "SE", "S", "SO", "O", "NO", "N", "NE")
+
+
+@njit(cache=True)
+def _setor_direcao(dx, dy):
+    """Índice em _SETORES_DIRECAO do setor de 45º em que cai o vetor (dx, dy)"""
+    angulo = math.atan2(dy, dx) * 180.0 / math.pi
+    if -22.5 <= angulo < 22.5:
+        return 0
+    elif 22.5 <= angulo < 67.5:
+        return 1
+    elif 67.5 <= angulo < 112.5:
+        return 2
+    elif 112.5 <= angulo < 157.5:
+        return 3
+    elif angulo >= 157.5 or angulo < -157.5:
+        return 4
+    elif -157.5 <= angulo < -112.5:
+        return 5
+    elif -112.5 <= angulo < -67.5:
+        return 6
+    return 7
 
 
 class AgenteQLearning(Agente):
@@ -59,6 +85,9 @@ class AgenteQLearning(Agente):
         
         # Ações disponíveis
         self.acoes_disponiveis = [Direcao.NORTE, Direcao.SUL, Direcao.ESTE, Direcao.OESTE]
+
+        # Última observação discretizada e o respetivo estado
+        self._ultimo_estado = (None, None)
     
     def age(self) -> Acao:
         """
@@ -68,7 +97,7 @@ class AgenteQLearning(Agente):
             Ação escolhida
         """
         if not self.observacao_atual:
-            return Acao("mover", {'direcao': Direcao.PARADO})
+            return Acao.mover(Direcao.PARADO)
         
         estado = self._extrair_estado(self.observacao_atual)
         dados = self.observacao_atual.dados
@@ -82,7 +111,7 @@ class AgenteQLearning(Agente):
             dados.get('no_fim', False) or 
             dados.get('distancia_farol', 999) == 0 or
             dados.get('distancia_fim', 999) == 0):
-            return Acao("mover", {'direcao': Direcao.PARADO})
+            return Acao.mover(Direcao.PARADO)
         
         # Escolher ação
         if self.modo_aprendizagem and random.random() < self.epsilon:
@@ -109,7 +138,7 @@ class AgenteQLearning(Agente):
         self.estado_anterior = estado
         self.acao_anterior = direcao.name
         
-        return Acao("mover", {'direcao': direcao})
+        return Acao.mover(direcao)
     
     def _direcoes_validas(self, dados: Dict) -> List[Direcao]:
         """Retorna lista de direções válidas (sem obstáculos)"""
@@ -175,6 +204,16 @@ class AgenteQLearning(Agente):
         Returns:
             String representando o estado
         """
+        # A mesma observação é discretizada no update Q e no age() seguinte
+        obs_anterior, estado = self._ultimo_estado
+        if obs is obs_anterior:
+            return estado
+        estado = self._discretizar(obs)
+        self._ultimo_estado = (obs, estado)
+        return estado
+
+    def _discretizar(self, obs: Observacao) -> str:
+        """Discretiza a observação no estado usado como chave da Q-table"""
         dados = obs.dados
         
         # Estratégia 1: Se tem direção do farol (ambiente Farol)
@@ -185,24 +224,8 @@ class AgenteQLearning(Agente):
             if dx == 0 and dy == 0:
                 dir_geral = "C"  # Centro (chegou)
             else:
-                angulo = np.arctan2(dy, dx) * 180 / np.pi
                 # Dividir em 8 direções
-                if -22.5 <= angulo < 22.5:
-                    dir_geral = "E"
-                elif 22.5 <= angulo < 67.5:
-                    dir_geral = "SE"
-                elif 67.5 <= angulo < 112.5:
-                    dir_geral = "S"
-                elif 112.5 <= angulo < 157.5:
-                    dir_geral = "SO"
-                elif angulo >= 157.5 or angulo < -157.5:
-                    dir_geral = "O"
-                elif -157.5 <= angulo < -112.5:
-                    dir_geral = "NO"
-                elif -112.5 <= angulo < -67.5:
-                    dir_geral = "N"
-                else:  # -67.5 <= angulo < -22.5
-                    dir_geral = "NE"
+                dir_geral = _SETORES_DIRECAO[_setor_direcao(dx, dy)]
             
             # Discretizar distância (perto, médio, longe)
             dist = dados.get('distancia_farol', 0)
@@ -216,7 +239,7 @@ class AgenteQLearning(Agente):
             # Obstáculos vizinhos (4 bits)
             obstaculos = dados.get('obstaculos_vizinhos', {})
             obs_str = ''.join(['1' if obstaculos.get(d.name, False) else '0' 
-                              for d in [Direcao.NORTE, Direcao.SUL, Direcao.ESTE, Direcao.OESTE]])
+                              for d in _DIRECOES_MOVEIS])
             
             return f"{dir_geral}_{dist_cat}_{obs_str}"
         
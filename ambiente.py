@@ -1,8 +1,23 @@
 from abc import ABC, abstractmethod
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Mapping
 from enum import Enum
+from collections import deque
+from types import MappingProxyType
 import numpy as np
 
+# Numba é opcional: sem ele, njit devolve a função Python original
+try:
+    from numba import njit
+    NUMBA_DISPONIVEL = True
+except ImportError:
+    NUMBA_DISPONIVEL = False
+
+    def njit(*args, **kwargs):
+        """Substituto de numba.njit quando o Numba não está instalado"""
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return lambda funcao: funcao
+
 
 class TipoAmbiente(Enum):
     FAROL = "farol"
@@ -18,10 +33,14 @@ class Direcao(Enum):
     PARADO = (0, 0)
 
 
+# Deslocamento (dx, dy) de cada direção, sem o acesso a Direcao.value (propriedade do Enum)
+_DESLOCAMENTOS_DIRECAO = {direcao: direcao.value for direcao in Direcao}
+
+
 class Observacao:
     """Representa a perceção que um agente tem do ambiente"""
 
-    def __init__(self, dados: Dict[str, Any], agente_id: str):
+    def __init__(self, dados: Mapping[str, Any], agente_id: str):
         self.dados = dados  # Informações sensoriais
         self.agente_id = agente_id
         self.passo_temporal: int = 0
@@ -31,33 +50,66 @@ class Observacao:
 
 
 class Acao:
-    """Representa uma ação que um agente pode executar"""
+    """Representa uma ação que um agente pode executar (imutável, pode ser partilhada)"""
+
+    __slots__ = ('tipo', 'parametros', 'direcao')
 
     def __init__(self, tipo: str, parametros: Dict[str, Any] = None):
-        self.tipo = tipo  # "mover", "recolher", "depositar", etc.
-        self.parametros = parametros or {}
-        self.agente_id: Optional[str] = None
+        object.__setattr__(self, 'tipo', tipo)  # "mover", "recolher", "depositar", etc.
+        object.__setattr__(self, 'parametros', MappingProxyType(dict(parametros or {})))
+        # Direção resolvida uma vez, para acesso por atributo no caminho crítico
+        object.__setattr__(self, 'direcao', self.parametros.get('direcao', Direcao.PARADO))
+
+    def __setattr__(self, nome, valor):
+        raise AttributeError(f"Acao é imutável (atributo '{nome}')")
+
+    def __delattr__(self, nome):
+        raise AttributeError(f"Acao é imutável (atributo '{nome}')")
+
+    def __reduce__(self):
+        return (Acao, (self.tipo, dict(self.parametros)))
+
+    @classmethod
+    def mover(cls, direcao: Direcao) -> 'Acao':
+        """Devolve a ação "mover" partilhada para a direção"""
+        return cls._acoes_mover[direcao]
 
     def __str__(self):
         return f"Acao[{self.tipo}, Params:{self.parametros}]"
 
 
+# Uma ação "mover" por direção, partilhada por todos os agentes (ver Acao.mover)
+Acao._acoes_mover = {direcao: Acao("mover", {'direcao': direcao}) for direcao in Direcao}
+
+
 class Posicao:
     """Representa uma posição no ambiente 2D"""
 
+    # Instâncias partilhadas por coordenada (ver Posicao.obter)
+    _pool: Dict[tuple, 'Posicao'] = {}
+
     def __init__(self, x: int, y: int):
         self.x = x
         self.y = y
 
+    @classmethod
+    def obter(cls, x: int, y: int) -> 'Posicao':
+        """Devolve a instância partilhada para (x, y), criando-a se necessário"""
+        pos = cls._pool.get((x, y))
+        if pos is None:
+            pos = cls._pool[(x, y)] = cls(x, y)
+        return pos
+
     def __eq__(self, other):
-        return self.x == other.x and self.y == other.y
+        return self is other or (self.x == other.x and self.y == other.y)
 
     def __hash__(self):
-        return hash((self.x, self.y))
+        # Coordenadas empacotadas num único int (16 bits cada) em vez de um tuplo
+        return ((self.x & 0xFFFF) << 16) | (self.y & 0xFFFF)
 
     def mover(self, direcao: Direcao) -> 'Posicao':
-        dx, dy = direcao.value
-        return Posicao(self.x + dx, self.y + dy)
+        dx, dy = _DESLOCAMENTOS_DIRECAO[direcao]
+        return Posicao.obter(self.x + dx, self.y + dy)
 
     def distancia(self, other: 'Posicao') -> float:
         return abs(self.x - other.x) + abs(self.y - other.y)
@@ -69,6 +121,9 @@ class Posicao:
 class Ambiente(ABC):
     """Classe abstrata base para todos os ambientes"""
 
+    # Número de posições guardadas em historico_posicoes (as mais recentes)
+    TAMANHO_HISTORICO = 256
+
     def __init__(self, largura: int, altura: int, parametros: Dict[str, Any] = None):
         self.largura = largura
         self.altura = altura
@@ -100,8 +155,10 @@ class Ambiente(ABC):
         """Regista um novo agente no ambiente"""
         self.agentes[agente_id] = {
             'posicao': posicao,
+            'posicao_inicial': posicao,
             'recursos': 0,
-            'historico_posicoes': [posicao]
+            # Buffer circular: append em O(1) e memória limitada por episódio
+            'historico_posicoes': deque([posicao], maxlen=self.TAMANHO_HISTORICO)
         }
 
     def posicao_valida(self, posicao: Posicao) -> bool:
@@ -115,6 +172,13 @@ class Ambiente(ABC):
             return self.agentes[agente_id]['posicao']
         return None
 
+    def obter_historico(self, agente_id: str) -> np.ndarray:
+        """Retorna as últimas posições de um agente num array (N, 2) de int32"""
+        historico = self.agentes[agente_id]['historico_posicoes']
+        xy = np.fromiter((c for p in historico for c in (p.x, p.y)),
+                         dtype=np.int32, count=2 * len(historico))
+        return xy.reshape(-1, 2)
+
     def terminar_episodio(self):
         """Marca o episódio como terminado"""
         self.terminado = True
@@ -130,18 +194,12 @@ class Ambiente(ABC):
         self.metricas = {}
         # Mantém agentes mas reseta suas posições e estado
         for agente_id in self.agentes:
-            pos_inicial = self.agentes[agente_id]['historico_posicoes'][0]
-            self.agentes[agente_id].update({
+            info = self.agentes[agente_id]
+            pos_inicial = info['posicao_inicial']
+            historico = info['historico_posicoes']
+            historico.clear()
+            historico.append(pos_inicial)
+            info.update({
                 'posicao': pos_inicial,
-                'recursos': 0,
-                'historico_posicoes': [pos_inicial]
-            })
-
-
-class FabricaAmbientes:
-    @staticmethod
-    def criar_ambiente(tipo: TipoAmbiente, parametros: Dict[str, Any] = None) -> 'Ambiente':
-        """
-        Método stub - a implementação real está no ficheiro FabricaAmbientes.py
-        """
-        raise NotImplementedError("Use a implementação completa em FabricaAmbientes.py")
\ No newline at end of file
+                'recursos': 0
+            })
\ No newline at end of file
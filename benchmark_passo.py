@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Benchmark do passo de simulação: sequencial vs. em lote (passo_em_lote)
+
+Mede o tempo médio por passo (µs) para cada configuração em configs/ e
+para populações sintéticas de agentes reativos, com e sem agir_lote.
+
+Executar: python benchmark_passo.py [passos]
+"""
+
+import contextlib
+import io
+import json
+import sys
+import time
+from pathlib import Path
+
+from MotorDeSimulacao import MotorDeSimulacao
+
+DIRETORIO_CONFIGS = Path(__file__).parent / "configs"
+NUM_AGENTES_SINTETICOS = (2, 10, 50)
+
+
+def _criar_motor(parametros, em_lote: bool) -> MotorDeSimulacao:
+    """Motor configurado sem visualização, pausas nem mensagens"""
+    parametros = dict(parametros, passo_em_lote=em_lote, usar_visualizacao=False,
+                      delay_entre_passos=0, verbose=False)
+    with contextlib.redirect_stdout(io.StringIO()):
+        motor = MotorDeSimulacao(parametros)
+        motor._configurar_ambiente(parametros.get('ambiente', {}))
+        motor._configurar_agentes(parametros.get('agentes', []))
+    return motor
+
+
+def medir(parametros, em_lote: bool, passos: int) -> float:
+    """Tempo médio por passo em µs (o episódio recomeça quando termina)"""
+    motor = _criar_motor(parametros, em_lote)
+    with contextlib.redirect_stdout(io.StringIO()):
+        motor._reset_episodio()
+        decorrido = 0.0
+        for _ in range(passos):
+            if motor.ambiente.terminado or motor.passo_atual >= motor.passos_totais:
+                motor._reset_episodio()
+            inicio = time.perf_counter()
+            motor._executar_passo()
+            decorrido += time.perf_counter() - inicio
+    return decorrido / passos * 1e6
+
+
+def _parametros_sinteticos(tipo: str, num_agentes: int):
+    """Ambiente 20x20 com 'num_agentes' agentes reativos"""
+    return {
+        'passos_totais': 200,
+        'ambiente': {'tipo': tipo, 'parametros': {'largura': 20, 'altura': 20}},
+        'agentes': [{'id': f'r{i}', 'tipo': 'reativo',
+                     'posicao_inicial': {'x': i % 20, 'y': (i // 20) % 20}}
+                    for i in range(num_agentes)],
+    }
+
+
+def main():
+    passos = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    casos = []
+    for ficheiro in sorted(DIRETORIO_CONFIGS.glob("*/*.json")):
+        if ficheiro.parent.name == "modelos":
+            continue
+        with open(ficheiro, 'r', encoding='utf-8') as f:
+            casos.append((f"{ficheiro.parent.name}/{ficheiro.stem}", json.load(f)))
+    for tipo in ("FAROL", "FORAGING", "LABIRINTO"):
+        for n in NUM_AGENTES_SINTETICOS:
+            casos.append((f"reativos/{tipo.lower()} x{n}", _parametros_sinteticos(tipo, n)))
+
+    print(f"{'caso':<28}{'sequencial':>12}{'em lote':>12}   (µs/passo, {passos} passos)")
+    for nome, parametros in casos:
+        sequencial = medir(parametros, False, passos)
+        em_lote = medir(parametros, True, passos)
+        print(f"{nome:<28}{sequencial:>12.1f}{em_lote:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
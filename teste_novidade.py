@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Testes da novidade (Novelty Search) com comportamentos fora da grelha
+
+Agentes que já chegaram ao objetivo podem mover-se para fora da grelha;
+o bitmap de comportamento não representa essas células e a novidade tem
+de ser calculada pelos códigos ordenados, com o mesmo resultado que a
+distância de Jaccard entre conjuntos.
+
+Executar: python -m unittest teste_novidade
+"""
+
+import unittest
+
+from FabricaAmbientes import FabricaAmbientes
+from ambiente import TipoAmbiente
+from agente import Agente, AgenteReativo
+from agentegenetico import PopulacaoEvolucionaria
+
+
+def _agentes(ambiente, comportamentos):
+    """Agentes reativos instalados (sem registo) no ambiente, com os comportamentos dados"""
+    agentes = []
+    for i, comportamento in enumerate(comportamentos):
+        agente = AgenteReativo(f"a{i}", {})
+        agente.ambiente = ambiente
+        agente.behavior = set(comportamento)
+        agentes.append(agente)
+    return agentes
+
+
+def _novidade_esperada(comportamento, outros, k):
+    """Referência: média das k menores distâncias de Jaccard entre conjuntos"""
+    distancias = sorted(Agente._jaccard_distance(comportamento, outro) for outro in outros)[:k]
+    return sum(distancias) / len(distancias) if distancias else 0.0
+
+
+class TesteNovidadeForaDaGrelha(unittest.TestCase):
+
+    def setUp(self):
+        self.ambiente = FabricaAmbientes.criar_ambiente(
+            TipoAmbiente.FAROL, {'largura': 10, 'altura': 10})
+
+    def test_celula_fora_da_grelha_nao_se_confunde(self):
+        # (1, 10) daria o mesmo índice de bitmap que (2, 0) numa grelha 10x10
+        agentes = _agentes(self.ambiente, [{(1, 10)}, {(2, 0)}])
+        self.assertIsNone(agentes[0].behavior_bits)
+        agentes[0].calculate_novelty(agentes, k_vizinhos=1)
+        self.assertEqual(agentes[0].novelty_score, 1.0)
+
+    def test_coordenada_negativa(self):
+        comportamentos = [{(0, 1), (-1, 1)}, {(0, 1), (1, 1)}, {(5, 5)}]
+        agentes = _agentes(self.ambiente, comportamentos)
+        for agente, comportamento in zip(agentes, comportamentos):
+            outros = [c for c in comportamentos if c is not comportamento]
+            agente.calculate_novelty(agentes, k_vizinhos=2)
+            self.assertAlmostEqual(agente.novelty_score,
+                                   _novidade_esperada(comportamento, outros, 2))
+
+    def test_arquivo_com_comportamento_fora_da_grelha(self):
+        populacao = PopulacaoEvolucionaria(
+            self.ambiente, {'tamanho_populacao': 3, 'num_steps': 5, 'k_vizinhos': 2})
+        comportamentos = [{(0, 1), (-1, 1)}, {(1, 10)}, {(3, 3), (3, 4)}]
+        for agente, comportamento in zip(populacao.populacao, comportamentos):
+            agente.ambiente = self.ambiente
+            agente.behavior = set(comportamento)
+        populacao._atualizar_arquivo()
+        self.assertIsNone(populacao._arquivo_bits)
+        self.assertEqual(len(populacao._arquivo_codigos), len(populacao.arquivo))
+
+        novo = _agentes(self.ambiente, [{(2, 0), (3, 3)}])[0]
+        self.assertAlmostEqual(populacao._novidade_arquivo(novo),
+                               _novidade_esperada(novo.behavior, populacao.arquivo, 2))
+
+    def test_arquivo_dentro_da_grelha_usa_bitmaps(self):
+        populacao = PopulacaoEvolucionaria(
+            self.ambiente, {'tamanho_populacao': 2, 'num_steps': 5, 'k_vizinhos': 2})
+        for agente, comportamento in zip(populacao.populacao, [{(0, 0), (0, 1)}, {(9, 9)}]):
+            agente.ambiente = self.ambiente
+            agente.behavior = set(comportamento)
+        populacao._atualizar_arquivo()
+        self.assertEqual(len(populacao._arquivo_bits), 2)
+
+        fora = _agentes(self.ambiente, [{(0, 1), (1, 10)}])[0]
+        self.assertAlmostEqual(populacao._novidade_arquivo(fora),
+                               _novidade_esperada(fora.behavior, populacao.arquivo, 2))
+
+
+if __name__ == "__main__":
+    unittest.main()
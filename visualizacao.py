@@ -5,6 +5,7 @@ Visualiza ambientes 2D, agentes, objetivos e recursos em tempo real
 
 import pygame
 import sys
+import threading
 from typing import Dict, Any, Optional, List
 from ambiente import Ambiente, Posicao, TipoAmbiente
 from agente import Agente
@@ -25,7 +26,8 @@ class Visualizador:
     COR_FIM = (255, 0, 0)
     COR_TEXTO = (0, 0, 0)
     
-    def __init__(self, ambiente: Ambiente, largura_janela: int = 800, altura_janela: int = 600):
+    def __init__(self, ambiente: Ambiente, largura_janela: int = 800, altura_janela: int = 600,
+                 desenho_fora_do_ecra: bool = False):
         """
         Inicializa o visualizador
         
@@ -33,6 +35,9 @@ class Visualizador:
             ambiente: Ambiente a visualizar
             largura_janela: Largura da janela em pixels
             altura_janela: Altura da janela em pixels
+            desenho_fora_do_ecra: Desenhar em superfícies fora do ecrã (duplo
+                buffer), para que desenhar() possa correr noutra thread; os
+                eventos e a apresentação ficam na thread principal
         """
         self.ambiente = ambiente
         self.largura_janela = largura_janela
@@ -44,7 +49,17 @@ class Visualizador:
         
         # Inicializar Pygame
         pygame.init()
-        self.tela = pygame.display.set_mode((largura_janela, altura_janela + 100))
+        self.janela = pygame.display.set_mode((largura_janela, altura_janela + 100))
+        # Superfície onde se desenha: a própria janela ou, fora do ecrã, o buffer
+        # de trás (trocado com self._pronta em concluir_desenho)
+        self.tela = self.janela
+        self._pronta = None
+        self._nova_pronta = False
+        self._trinco_buffers = None
+        if desenho_fora_do_ecra:
+            self.tela = pygame.Surface(self.janela.get_size())
+            self._pronta = pygame.Surface(self.janela.get_size())
+            self._trinco_buffers = threading.Lock()
         pygame.display.set_caption("Simulador SMA - Sistema Multi-Agente")
         self.relogio = pygame.time.Clock()
         self.fonte = pygame.font.Font(None, 24)
@@ -303,6 +318,36 @@ class Visualizador:
             passo: Passo atual da simulação
             agentes: Lista de agentes (opcional)
         """
+        if not self.processar_eventos():
+            return False
+        self.desenhar(passo, agentes)
+        self.apresentar()
+        return True
+    
+    def processar_eventos(self) -> bool:
+        """
+        Processa os eventos da janela (só na thread principal, que a criou)
+        
+        Returns:
+            False se o utilizador pediu para sair
+        """
+        for evento in pygame.event.get():
+            if evento.type == pygame.QUIT:
+                return False
+            elif evento.type == pygame.KEYDOWN:
+                if evento.key == pygame.K_SPACE:
+                    self.pausado = not self.pausado
+                elif evento.key == pygame.K_q:
+                    return False
+        return True
+    
+    def desenhar(self, passo: int, agentes: List[Agente] = None):
+        """
+        Desenha o estado atual em self.tela (sem o mostrar)
+        
+        Única parte da atualização que lê o ambiente e os agentes; com
+        desenho_fora_do_ecra pode correr fora da thread principal.
+        """
         # Atualizar mapeamento de tipos de agentes
         if agentes:
             for agente in agentes:
@@ -315,16 +360,6 @@ class Visualizador:
                     self.tipos_agentes[agente.agente_id] = "R"
                 else:
                     self.tipos_agentes[agente.agente_id] = agente.agente_id[0].upper()
-        # Processar eventos
-        for evento in pygame.event.get():
-            if evento.type == pygame.QUIT:
-                return False
-            elif evento.type == pygame.KEYDOWN:
-                if evento.key == pygame.K_SPACE:
-                    self.pausado = not self.pausado
-                elif evento.key == pygame.K_q:
-                    return False
-        
         # Limpar tela
         self.tela.fill(self.COR_FUNDO)
         
@@ -343,12 +378,30 @@ class Visualizador:
         
         # Desenhar informações
         self.desenhar_info(passo, agentes)
-        
-        # Atualizar display
+    
+    def concluir_desenho(self):
+        """Fora do ecrã: torna o fotograma desenhado no próximo a apresentar (troca de buffers)"""
+        with self._trinco_buffers:
+            self.tela, self._pronta = self._pronta, self.tela
+            self._nova_pronta = True
+    
+    def apresentar(self):
+        """Mostra o que foi desenhado, limitado a self.velocidade fotogramas por segundo"""
         pygame.display.flip()
         self.relogio.tick(self.velocidade)
+    
+    def apresentar_pronta(self):
+        """
+        Fora do ecrã: mostra o último fotograma concluído, se houver um novo
         
-        return True
+        Só na thread principal; não limita os FPS (não atrasa o passo).
+        """
+        with self._trinco_buffers:
+            if not self._nova_pronta:
+                return
+            self.janela.blit(self._pronta, (0, 0))
+            self._nova_pronta = False
+        pygame.display.flip()
     
     def fechar(self):
         """Fecha a visualização"""